@@ -6,7 +6,84 @@ Sui客户端快速开始脚本
 
 import sys
 import os
-from sui_client import SuiContractClient
+import time
+import functools
+
+# 对象信息会随修改而变化，缓存时间较短；已确认的交易不可变，可长期缓存
+OBJECT_CACHE_TTL = 30
+TRANSACTION_CACHE_TTL = 86400
+
+# 部署成功后保存包ID的文件
+PACKAGE_ID_FILE = "deployed_package_id.txt"
+
+# 进程内复用的客户端实例，菜单各操作共享同一个 keep-alive 连接
+# sui_client 会连带导入 pysui，延迟到首次使用时再导入以加快启动
+_ClientCls = None
+_client = None
+
+
+def _get_client():
+    """获取（必要时创建）共享的客户端实例"""
+    global _ClientCls, _client
+    if _client is None:
+        if _ClientCls is None:
+            from sui_client import SuiContractClient
+            _ClientCls = SuiContractClient
+        _client = _ClientCls()
+    return _client
+
+
+# 查询结果缓存: {key: (过期时间, 数据)}
+_ttl_cache = {}
+
+
+def _ttl_get(key, fetcher, ttl):
+    """命中未过期的缓存时直接返回，否则调用fetcher并缓存结果"""
+    now = time.monotonic()
+    entry = _ttl_cache.get(key)
+    if entry is not None and entry[0] > now:
+        return entry[1]
+    data = fetcher()
+    # 查询失败的结果不缓存，便于用户重试
+    if isinstance(data, dict) and 'error' not in data:
+        _ttl_cache[key] = (now + ttl, data)
+    return data
+
+
+def _ttl_get_many(kind, keys, fetcher, ttl):
+    """_ttl_get的批量版本，只为未命中缓存的key调用一次fetcher"""
+    now = time.monotonic()
+    results = {}
+    missing = []
+    for key in dict.fromkeys(keys):
+        entry = _ttl_cache.get((kind, key))
+        if entry is not None and entry[0] > now:
+            results[key] = entry[1]
+        else:
+            missing.append(key)
+    if missing:
+        for key, data in zip(missing, fetcher(missing)):
+            results[key] = data
+            if isinstance(data, dict) and 'error' not in data:
+                _ttl_cache[(kind, key)] = (now + ttl, data)
+    return [results[key] for key in keys]
+
+
+def _invalidate_objects(object_changes):
+    """移除被交易修改过的对象缓存"""
+    for change in object_changes or []:
+        object_id = change.get('objectId')
+        if object_id:
+            _ttl_cache.pop(('object', object_id), None)
+
+
+@functools.lru_cache(maxsize=1)
+def _load_package_id():
+    """读取已保存的包ID，会话内只读取一次文件"""
+    if not os.path.exists(PACKAGE_ID_FILE):
+        return None
+    with open(PACKAGE_ID_FILE, "r") as f:
+        return f.read().strip() or None
 
 
 def print_banner():
@@ -18,32 +95,65 @@ def print_banner():
     print()
 
 
-def print_menu():
-    """打印主菜单"""
-    print("📋 请选择要执行的操作:")
-    print("1. 🧪 测试基本功能（推荐首次运行）")
-    print("2. 💰 查询账户余额")
-    print("3. 🚀 部署示例合约")
-    print("4. 📞 调用合约函数")
-    print("5. 🔍 查询对象信息")
-    print("6. 📊 查询交易信息")
-    print("7. 🎯 运行完整示例")
-    print("8. ❓ 显示帮助信息")
-    print("0. 👋 退出程序")
-    print("-" * 40)
+# 主菜单文本在导入时拼接一次，每次循环只需一次写入
+_MENU_TEXT = "\n".join([
+    "📋 请选择要执行的操作:",
+    "1. 🧪 测试基本功能（推荐首次运行）",
+    "2. 💰 查询账户余额",
+    "3. 🚀 部署示例合约",
+    "4. 📞 调用合约函数",
+    "5. 🔍 查询对象信息",
+    "6. 📊 查询交易信息",
+    "7. 🎯 运行完整示例",
+    "8. ❓ 显示帮助信息",
+    "0. 👋 退出程序",
+    "-" * 40,
+]) + "\n"
+_MENU_PROMPT = "请输入选项 (0-8): "
+
+# 启用输入行编辑与历史记录（Windows等平台可能没有readline）
+try:
+    import readline  # noqa: F401
+except ImportError:
+    pass
+
+
+def read_choice():
+    """输出菜单并读取选项，菜单与提示合并为一次写入"""
+    try:
+        return input(_MENU_TEXT + _MENU_PROMPT).strip()
+    except EOFError:
+        # 输入流结束时按退出处理
+        return "0"
 
 
 def test_basic_functionality():
     """运行基本功能测试"""
     print("\n🧪 运行基本功能测试...")
-    os.system("python test_client.py")
+    # 在当前解释器内运行，避免启动新进程
+    try:
+        from test_client import main as _test_main
+    except ImportError as e:
+        print(f"❌ 无法加载test_client.py: {e}")
+        return
+    try:
+        client = _get_client()
+    except Exception as e:
+        print(f"❌ 客户端初始化失败: {e}")
+        return
+    try:
+        # 复用菜单的共享客户端，不再为测试单独建立连接
+        _test_main(client)
+    except SystemExit:
+        # test_client在测试失败时调用sys.exit(1)，不应退出菜单
+        pass
 
 
 def check_balance():
     """查询账户余额"""
     try:
         print("\n💰 查询账户余额...")
-        client = SuiContractClient()
+        client = _get_client()
         balance_info = client.get_account_balance()
         
         print(f"✅ 余额查询成功:")
@@ -70,14 +180,17 @@ def deploy_contract():
             print("   请确保example_contract目录存在并包含有效的Move项目")
             return
         
-        client = SuiContractClient()
+        client = _get_client()
         
-        # 检查余额
-        balance_info = client.get_account_balance()
-        if balance_info['total_balance_sui'] < 0.2:
+        # 余额、gas价格与gas对象合并为一次批量请求，复用已建立的连接
+        preflight = client.deploy_preflight()
+        if preflight['total_balance_sui'] < 0.2:
             print("❌ 余额不足，建议至少有0.2 SUI进行部署")
             print("   运行命令获取测试币: sui client faucet")
             return
+        if preflight['gas_object'] is None:
+            print("❌ 未找到可用于支付gas的SUI币对象")
+            return
         
         print("   编译和部署合约中...")
         deploy_result = client.deploy_contract(
@@ -90,11 +203,13 @@ def deploy_contract():
         print(f"   UpgradeCap ID: {deploy_result['upgrade_cap_id']}")
         print(f"   事务哈希: {deploy_result['transaction_hash']}")
         print(f"   Gas使用: {deploy_result['gas_used']}")
+        _invalidate_objects(deploy_result['full_result'].get('objectChanges'))
         
         # 保存包ID到文件，供后续调用使用
-        with open("deployed_package_id.txt", "w") as f:
+        with open(PACKAGE_ID_FILE, "w") as f:
             f.write(deploy_result['package_id'])
-        print(f"   📝 包ID已保存到 deployed_package_id.txt")
+        _load_package_id.cache_clear()
+        print(f"   📝 包ID已保存到 {PACKAGE_ID_FILE}")
         
     except Exception as e:
         print(f"❌ 合约部署失败: {e}")
@@ -106,10 +221,7 @@ def call_contract():
         print("\n📞 调用合约函数...")
         
         # 尝试从文件读取包ID
-        package_id = None
-        if os.path.exists("deployed_package_id.txt"):
-            with open("deployed_package_id.txt", "r") as f:
-                package_id = f.read().strip()
+        package_id = _load_package_id()
         
         if not package_id:
             package_id = input("请输入合约包ID: ").strip()
@@ -119,7 +231,7 @@ def call_contract():
         
         print(f"   使用包ID: {package_id}")
         
-        client = SuiContractClient()
+        client = _get_client()
         
         # 调用create_greeting函数
         print("   调用create_greeting函数...")
@@ -134,6 +246,7 @@ def call_contract():
         print("✅ 函数调用成功!")
         print(f"   事务哈希: {call_result['transaction_hash']}")
         print(f"   Gas使用: {call_result['gas_used']}")
+        _invalidate_objects(call_result['object_changes'])
         
         if call_result['object_changes']:
             for change in call_result['object_changes']:
@@ -144,47 +257,84 @@ def call_contract():
         print(f"❌ 合约函数调用失败: {e}")
 
 
+def _split_ids(raw):
+    """将逗号或空白分隔的输入拆分为ID列表"""
+    return raw.replace(",", " ").split()
+
+
+def _print_object_info(object_id, object_info):
+    print(f"   对象ID: {object_id}")
+    print(f"   对象类型: {object_info.get('data', {}).get('type', 'Unknown')}")
+    print(f"   拥有者: {object_info.get('data', {}).get('owner', 'Unknown')}")
+    print(f"   版本: {object_info.get('data', {}).get('version', 'Unknown')}")
+
+
+def _print_transaction_info(tx_hash, tx_info):
+    print(f"   交易哈希: {tx_hash}")
+    print(f"   状态: {tx_info.get('effects', {}).get('status', {}).get('status', 'Unknown')}")
+    print(f"   Gas费用: {tx_info.get('effects', {}).get('gasUsed', 'Unknown')}")
+    print(f"   发送者: {tx_info.get('transaction', {}).get('data', {}).get('sender', 'Unknown')}")
+
+
 def query_object():
-    """查询对象信息"""
+    """查询对象信息，支持一次输入多个以逗号或空格分隔的ID"""
     try:
-        object_id = input("请输入对象ID: ").strip()
-        if not object_id:
+        object_ids = _split_ids(input("请输入对象ID: "))
+        if not object_ids:
             print("❌ 未提供对象ID")
             return
         
-        print(f"\n🔍 查询对象信息: {object_id}")
+        client = _get_client()
         
-        client = SuiContractClient()
-        object_info = client.get_object_info(object_id)
+        if len(object_ids) == 1:
+            object_id = object_ids[0]
+            print(f"\n🔍 查询对象信息: {object_id}")
+            object_info = _ttl_get(('object', object_id),
+                                   lambda: client.get_object_info(object_id),
+                                   OBJECT_CACHE_TTL)
+            print("✅ 对象信息查询成功:")
+            _print_object_info(object_id, object_info)
+            return
         
+        # 多个对象通过一次multiGet请求查询
+        print(f"\n🔍 批量查询对象信息: {len(object_ids)} 个")
+        object_infos = _ttl_get_many('object', object_ids, client.get_object_infos, OBJECT_CACHE_TTL)
         print("✅ 对象信息查询成功:")
-        print(f"   对象ID: {object_id}")
-        print(f"   对象类型: {object_info.get('data', {}).get('type', 'Unknown')}")
-        print(f"   拥有者: {object_info.get('data', {}).get('owner', 'Unknown')}")
-        print(f"   版本: {object_info.get('data', {}).get('version', 'Unknown')}")
+        for object_id, object_info in zip(object_ids, object_infos):
+            _print_object_info(object_id, object_info)
+            print()
         
     except Exception as e:
         print(f"❌ 对象信息查询失败: {e}")
 
 
 def query_transaction():
-    """查询交易信息"""
+    """查询交易信息，支持一次输入多个以逗号或空格分隔的哈希"""
     try:
-        tx_hash = input("请输入交易哈希: ").strip()
-        if not tx_hash:
+        tx_hashes = _split_ids(input("请输入交易哈希: "))
+        if not tx_hashes:
             print("❌ 未提供交易哈希")
             return
         
-        print(f"\n📊 查询交易信息: {tx_hash}")
+        client = _get_client()
         
-        client = SuiContractClient()
-        tx_info = client.get_transaction_info(tx_hash)
+        if len(tx_hashes) == 1:
+            tx_hash = tx_hashes[0]
+            print(f"\n📊 查询交易信息: {tx_hash}")
+            tx_info = _ttl_get(('transaction', tx_hash),
+                               lambda: client.get_transaction_info(tx_hash),
+                               TRANSACTION_CACHE_TTL)
+            print("✅ 交易信息查询成功:")
+            _print_transaction_info(tx_hash, tx_info)
+            return
         
+        # 多笔交易通过一次multiGet请求查询
+        print(f"\n📊 批量查询交易信息: {len(tx_hashes)} 笔")
+        tx_infos = _ttl_get_many('transaction', tx_hashes, client.get_transaction_infos, TRANSACTION_CACHE_TTL)
         print("✅ 交易信息查询成功:")
-        print(f"   交易哈希: {tx_hash}")
-        print(f"   状态: {tx_info.get('effects', {}).get('status', {}).get('status', 'Unknown')}")
-        print(f"   Gas费用: {tx_info.get('effects', {}).get('gasUsed', 'Unknown')}")
-        print(f"   发送者: {tx_info.get('transaction', {}).get('data', {}).get('sender', 'Unknown')}")
+        for tx_hash, tx_info in zip(tx_hashes, tx_infos):
+            _print_transaction_info(tx_hash, tx_info)
+            print()
         
     except Exception as e:
         print(f"❌ 交易信息查询失败: {e}")
@@ -193,7 +343,17 @@ def query_transaction():
 def run_full_example():
     """运行完整示例"""
     print("\n🎯 运行完整示例...")
-    os.system("python usage_example.py")
+    try:
+        from usage_example import main as _example_main
+    except ImportError as e:
+        print(f"❌ 无法加载usage_example.py: {e}")
+        return
+    try:
+        client = _get_client()
+    except Exception as e:
+        print(f"❌ 客户端初始化失败: {e}")
+        return
+    _example_main(client)
 
 
 def show_help():
@@ -216,39 +376,41 @@ def show_help():
     print("=" * 50)
 
 
+# 菜单选项到处理函数的映射，新增菜单项只需在此登记
+_DISPATCH = {
+    "1": test_basic_functionality,
+    "2": check_balance,
+    "3": deploy_contract,
+    "4": call_contract,
+    "5": query_object,
+    "6": query_transaction,
+    "7": run_full_example,
+    "8": show_help,
+}
+
+
 def main():
     """主函数"""
     print_banner()
     
     while True:
-        print_menu()
-        choice = input("请输入选项 (0-8): ").strip()
+        choice = read_choice()
         
         if choice == "0":
             print("\n👋 感谢使用Sui客户端程序！")
             break
-        elif choice == "1":
-            test_basic_functionality()
-        elif choice == "2":
-            check_balance()
-        elif choice == "3":
-            deploy_contract()
-        elif choice == "4":
-            call_contract()
-        elif choice == "5":
-            query_object()
-        elif choice == "6":
-            query_transaction()
-        elif choice == "7":
-            run_full_example()
-        elif choice == "8":
-            show_help()
-        else:
+        
+        action = _DISPATCH.get(choice)
+        if action is None:
             print("❌ 无效选项，请重新选择")
+        else:
+            action()
         
-        if choice != "0":
+        try:
             input("\n按回车键继续...")
-            print()
+        except EOFError:
+            break
+        print()
 
 
 if __name__ == "__main__":
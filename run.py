@@ -13,20 +13,34 @@ import argparse
 from pathlib import Path
 from typing import Any, Optional
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # 將當前目錄加入模塊路徑
 sys.path.insert(0, str(Path(__file__).parent))
 
 
-def build_client(protocol: str) -> tuple[str, Any]:
+def format_json(data: Any) -> str:
+    """格式化輸出結果；可用時使用 orjson，否則回退到標準庫 json。"""
+    if orjson is not None:
+        return orjson.dumps(data, default=str, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode('utf-8')
+    return json.dumps(data, indent=2, ensure_ascii=False, default=str)
+
+
+def build_client(protocol: str, batch_size: Optional[int] = None) -> tuple[str, Any]:
     """根據協議構造客戶端。
 
     Returns: (effective_protocol, client_instance)
     """
     # 延遲導入，避免未安裝時阻塞其他協議
-    from sui_client import SuiContractClient
+    from sui_client import SuiContractClient, MAX_BATCH_SIZE
+
+    jsonrpc_kwargs = {'batch_size': batch_size or MAX_BATCH_SIZE}
 
     if protocol == 'jsonrpc':
-        return 'jsonrpc', SuiContractClient()
+        return 'jsonrpc', SuiContractClient(**jsonrpc_kwargs)
 
     if protocol == 'grpc':
         try:
@@ -43,7 +57,7 @@ def build_client(protocol: str) -> tuple[str, Any]:
         return eff, cli
     except Exception as e:
         print(f"⚠️ gRPC 無法使用，回退到 JSON-RPC。原因: {e}")
-        return 'jsonrpc', SuiContractClient()
+        return 'jsonrpc', SuiContractClient(**jsonrpc_kwargs)
 
 
 def read_line(prompt: str) -> str:
@@ -79,93 +93,126 @@ def read_json_list(prompt: str) -> list[Any]:
         return []
 
 
-def show_menu(effective_protocol: str, active_address: str) -> None:
-    print("\n============== Pysui 統一菜單 ==============")
-    print(f"協議: {effective_protocol.upper()}    活躍地址: {active_address}")
-    print("1) 查詢賬戶餘額")
-    print("2) 部署合約 (Move 包)")
-    print("3) 調用合約函數")
-    print("4) 查詢對象信息")
-    print("5) 查詢交易信息")
-    print("0) 退出")
-    print("=========================================")
+def action_balance(client: Any) -> None:
+    try:
+        info = client.get_account_balance()
+        print(format_json(info))
+    except Exception as e:
+        print(f"❌ 查詢餘額失敗: {e}")
 
 
-def main():
+def action_deploy(client: Any) -> None:
+    pkg = read_line('Move 包路徑 (例如 ./example_contract): ')
+    gas = read_int('Gas 預算 (mists，可空): ')
+    build_args = read_json_list('構建參數 JSON 陣列 (可空): ')
+    try:
+        res = client.deploy_contract(package_path=pkg, gas_budget=gas, build_args=build_args or None)
+        print(format_json(res))
+    except Exception as e:
+        print(f"❌ 部署失敗: {e}")
+
+
+def action_call(client: Any) -> None:
+    package_id = read_line('package_id: ')
+    module_name = read_line('module_name: ')
+    function_name = read_line('function_name: ')
+    args_list = read_json_list('arguments (JSON 陣列，可空): ')
+    type_args = read_json_list('type_arguments (JSON 陣列，可空): ')
+    gas = read_int('Gas 預算 (mists，可空): ')
+    try:
+        res = client.call_contract_function(
+            package_id=package_id,
+            module_name=module_name,
+            function_name=function_name,
+            arguments=args_list or None,
+            type_arguments=type_args or None,
+            gas_budget=gas,
+        )
+        print(format_json(res))
+    except Exception as e:
+        print(f"❌ 調用失敗: {e}")
+
+
+def action_object(client: Any) -> None:
+    object_id = read_line('object_id: ')
+    try:
+        res = client.get_object_info(object_id)
+        print(format_json(res))
+    except Exception as e:
+        print(f"❌ 查詢對象失敗: {e}")
+
+
+def action_transaction(client: Any) -> None:
+    tx = read_line('交易哈希 (digest): ')
+    try:
+        res = client.get_transaction_info(tx)
+        print(format_json(res))
+    except Exception as e:
+        print(f"❌ 查詢交易失敗: {e}")
+
+
+# 菜單選項到處理函數的映射
+_ACTIONS = {
+    '1': action_balance,
+    '2': action_deploy,
+    '3': action_call,
+    '4': action_object,
+    '5': action_transaction,
+}
+
+
+def render_menu(effective_protocol: str, active_address: str) -> str:
+    """生成菜單文本；協議與地址在一次會話內不變，只需生成一次。"""
+    return "\n".join([
+        "\n============== Pysui 統一菜單 ==============",
+        f"協議: {effective_protocol.upper()}    活躍地址: {active_address}",
+        "1) 查詢賬戶餘額",
+        "2) 部署合約 (Move 包)",
+        "3) 調用合約函數",
+        "4) 查詢對象信息",
+        "5) 查詢交易信息",
+        "0) 退出",
+        "=========================================",
+    ]) + "\n"
+
+
+def _build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description='Pysui Client Launcher (Unified Menu)')
     parser.add_argument('--protocol', dest='protocol', default='auto',
                         choices=['jsonrpc', 'grpc', 'auto'],
                         help='選擇協議: jsonrpc | grpc | auto (默認: auto)')
-    args = parser.parse_args()
+    parser.add_argument('--batch-size', dest='batch_size', type=int, default=None,
+                        help='JSON-RPC 批量請求的最大調用數 (默認且上限: 20)')
+    return parser
+
+
+_PARSER = _build_parser()
+
+
+def main():
+    args = _PARSER.parse_args()
 
     try:
-        effective_protocol, client = build_client(args.protocol)
+        effective_protocol, client = build_client(args.protocol, args.batch_size)
         # 嘗試拿到活躍地址
         active_address = getattr(client, 'active_address', '')
-
-        while True:
-            show_menu(effective_protocol, str(active_address))
-            choice = read_line('請選擇操作: ')
-
-            if choice == '0':
-                print('再見!')
-                return
-
-            elif choice == '1':
-                try:
-                    info = client.get_account_balance()
-                    print(json.dumps(info, indent=2, ensure_ascii=False))
-                except Exception as e:
-                    print(f"❌ 查詢餘額失敗: {e}")
-
-            elif choice == '2':
-                pkg = read_line('Move 包路徑 (例如 ./example_contract): ')
-                gas = read_int('Gas 預算 (mists，可空): ')
-                build_args = read_json_list('構建參數 JSON 陣列 (可空): ')
-                try:
-                    res = client.deploy_contract(package_path=pkg, gas_budget=gas, build_args=build_args or None)
-                    print(json.dumps(res, indent=2, ensure_ascii=False))
-                except Exception as e:
-                    print(f"❌ 部署失敗: {e}")
-
-            elif choice == '3':
-                package_id = read_line('package_id: ')
-                module_name = read_line('module_name: ')
-                function_name = read_line('function_name: ')
-                args_list = read_json_list('arguments (JSON 陣列，可空): ')
-                type_args = read_json_list('type_arguments (JSON 陣列，可空): ')
-                gas = read_int('Gas 預算 (mists，可空): ')
-                try:
-                    res = client.call_contract_function(
-                        package_id=package_id,
-                        module_name=module_name,
-                        function_name=function_name,
-                        arguments=args_list or None,
-                        type_arguments=type_args or None,
-                        gas_budget=gas,
-                    )
-                    print(json.dumps(res, indent=2, ensure_ascii=False))
-                except Exception as e:
-                    print(f"❌ 調用失敗: {e}")
-
-            elif choice == '4':
-                object_id = read_line('object_id: ')
-                try:
-                    res = client.get_object_info(object_id)
-                    print(json.dumps(res, indent=2, ensure_ascii=False))
-                except Exception as e:
-                    print(f"❌ 查詢對象失敗: {e}")
-
-            elif choice == '5':
-                tx = read_line('交易哈希 (digest): ')
-                try:
-                    res = client.get_transaction_info(tx)
-                    print(json.dumps(res, indent=2, ensure_ascii=False))
-                except Exception as e:
-                    print(f"❌ 查詢交易失敗: {e}")
-
-            else:
-                print('無效選擇，請重試。')
+        menu_text = render_menu(effective_protocol, str(active_address))
+
+        # 連接（gRPC 通道 / HTTP 連接池）在整個會話內複用，退出時統一關閉
+        with client:
+            while True:
+                sys.stdout.write(menu_text)
+                choice = read_line('請選擇操作: ')
+
+                if choice == '0':
+                    print('再見!')
+                    return
+
+                action = _ACTIONS.get(choice)
+                if action is None:
+                    print('無效選擇，請重試。')
+                else:
+                    action(client)
 
     except Exception as e:
         print(f"❌ 啟動失敗: {e}")
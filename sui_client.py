@@ -11,11 +11,36 @@ deprecation警告是预期的，不影响功能。
 import warnings
 import logging
 import sys
+import re
 import json
+import time
+import importlib.util
+import socket
+import base64
+import subprocess
+from contextlib import contextmanager
+from functools import partial
+from operator import attrgetter
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Any, Optional, Union
+from types import SimpleNamespace
+from typing import List, Dict, Any, Iterator, Optional, Tuple, Union
+
+# 优先使用orjson（C实现）进行JSON编解码，不可用时回退到标准库
+try:
+    import orjson
+    _json_dumps = orjson.dumps
+    _json_loads = orjson.loads
+except ImportError:
+    orjson = None
+    _json_loads = json.loads
+
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode('utf-8')
 
 # 抑制pysui的deprecation警告（我们故意使用JSON-RPC）
+# deprecated装饰器的警告归属于调用方模块（包括直接调用pysui的脚本），只按模块名无法覆盖，
+# 因此保留按消息文本的过滤
 warnings.filterwarnings("ignore", category=DeprecationWarning, module="pysui.*")
 warnings.filterwarnings("ignore", message=".*deprecated.*", category=DeprecationWarning)
 
@@ -25,6 +50,8 @@ from pysui.sui.sui_txn.sync_transaction import SuiTransaction
 from pysui.sui.sui_types.scalars import SuiU64, SuiU8, SuiString, SuiInteger
 from pysui.sui.sui_types.collections import SuiArray
 from pysui.sui.sui_bcs import bcs
+import pysui.sui.sui_builders.get_builders as get_builders
+import httpx
 
 # 配置日志
 logging.basicConfig(
@@ -36,6 +63,111 @@ logger = logging.getLogger(__name__)
 # 抑制deprecation相关的日志
 logging.getLogger("deprecated").setLevel(logging.ERROR)
 
+# 单个JSON-RPC批量请求中允许的最大调用数
+# 部分RPC服务商会对过大的批次计费或限流，因此保持一个较小的上限
+MAX_BATCH_SIZE = 20
+
+SUI_COIN_TYPE = "0x2::sui::SUI"
+
+# sui_multiGetObjects / sui_multiGetTransactionBlocks 单次调用允许的最大ID数量
+MULTI_GET_LIMIT = 50
+
+# 对象与交易查询返回的字段
+OBJECT_QUERY_OPTIONS = {"showType": True, "showContent": True, "showOwner": True}
+TRANSACTION_QUERY_OPTIONS = {
+    "showInput": True,
+    "showEffects": True,
+    "showEvents": True,
+    "showObjectChanges": True
+}
+
+# HTTP/2依赖h2包，未安装时退回HTTP/1.1 keep-alive
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# JSON-RPC连接池：最多保持的空闲keep-alive连接数与总连接数，连接失败时的重试次数
+HTTP_KEEPALIVE_CONNECTIONS = 4
+HTTP_MAX_CONNECTIONS = 16
+HTTP_CONNECT_RETRIES = 2
+HTTP_KEEPALIVE_EXPIRY = 60
+
+# 关闭Nagle算法：JSON-RPC请求体很小，不等待合并发送
+_TCP_NODELAY_OPTIONS = [(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)]
+
+# 发布交易创建的UpgradeCap对象类型后缀（0x2::package::UpgradeCap）
+UPGRADE_CAP_SUFFIX = "::package::UpgradeCap"
+
+# SuiCoinObject中余额汇总需要的字段，一次C层调用取出
+_coin_fields = attrgetter('coin_object_id', 'version', 'digest', 'coin_type', 'balance')
+
+# 合约调用参数中的对象ID：0x加64位十六进制（\Z不接受末尾换行）
+_is_object_id = re.compile(r'\A0x[0-9a-fA-F]{64}\Z').match
+
+
+def _str_arg(arg: str, _match=_is_object_id, _oid=ObjectID, _str=SuiString) -> Any:
+    """字符串参数：对象ID转为ObjectID，其余作为SuiString"""
+    return _oid(arg) if _match(arg) else _str(arg)
+
+
+def _passthrough_arg(arg: Any) -> Any:
+    return arg
+
+
+# 按参数的精确类型分派转换函数；bool虽是int的子类，但按原样传递
+_ARG_DISPATCH = {
+    str: _str_arg,
+    bytes: list,  # vector<u8>需要list[int]
+    int: SuiU64,
+    bool: _passthrough_arg,
+}
+
+
+def _convert_args(arguments: Optional[List[Any]]) -> List[Any]:
+    """按_ARG_DISPATCH转换合约调用参数"""
+    convert = _ARG_DISPATCH.get
+    passthrough = _passthrough_arg
+    return [convert(type(arg), passthrough)(arg) for arg in arguments or ()]
+
+
+def _to_dict_encoded(data: Any) -> Any:
+    try:
+        return data.to_dict(encode_json=True)
+    except TypeError:
+        return data.to_dict()
+
+
+def _model_dump_json(data: Any) -> Any:
+    return data.model_dump(mode='json', by_alias=True)
+
+
+def _loads_to_json(data: Any) -> Any:
+    return _json_loads(data.to_json())
+
+
+def _resolve_plain_converter(data: Any):
+    """
+    为结果对象选择转换函数
+    
+    优先直接读取对象字段（dataclasses_json的to_dict / pydantic的model_dump），
+    避免先序列化成JSON字符串再解析回来；都不支持时才走to_json。
+    """
+    if hasattr(data, 'to_dict'):
+        return _to_dict_encoded
+    if hasattr(data, 'model_dump'):
+        return _model_dump_json
+    if hasattr(data, 'to_json'):
+        return _loads_to_json
+    return _passthrough_arg
+
+
+# 批量部署/调用时并发执行事务的线程数
+DEFAULT_POOL_SIZE = 8
+
+# 交易gas上限的缓存时间（秒），仅在epoch切换时变化
+GAS_INFO_TTL = 60
+
+# 同一RPC地址连接检查结果的有效时间（秒）
+CONNECTIVITY_TTL = 60
+
 
 class SuiContractClient:
     """
@@ -52,42 +184,194 @@ class SuiContractClient:
     deprecation警告是预期的，不影响功能正常使用。
     """
     
-    def __init__(self, config_path: Optional[str] = None):
+    __slots__ = (
+        'batch_size', 'pool_size', 'config', 'client', 'active_address',
+        '_executor', '_cache', '_Builders', '_make_txn',
+    )
+    
+    # 结果类型 -> 转换函数，见_to_plain
+    _plain_converters: Dict[type, Any] = {}
+    
+    # rpc_url -> 最近一次连接检查成功的时间（time.monotonic）
+    _connectivity_cache: Dict[str, float] = {}
+    
+    def __init__(self,
+                 config_path: Optional[str] = None,
+                 batch_size: int = MAX_BATCH_SIZE,
+                 pool_size: int = DEFAULT_POOL_SIZE):
         """
         初始化Sui客户端
         
         Args:
             config_path: Sui配置文件路径，默认使用default_config()
+            batch_size: 每个JSON-RPC批量请求包含的最大调用数，上限为MAX_BATCH_SIZE
+            pool_size: 批量部署/调用时的并发线程数
         """
         try:
+            self.batch_size = max(1, min(batch_size, MAX_BATCH_SIZE))
+            self.pool_size = max(1, pool_size)
+            self._executor = ThreadPoolExecutor(max_workers=self.pool_size)
+            self._cache: Dict[str, Tuple[Any, float]] = {}
+
             if config_path:
                 self.config = SuiConfig.user_config(config_path)
             else:
                 self.config = SuiConfig.default_config()
             
             self.client = SyncClient(self.config)
+            self._install_http_client()
+            self._resolve_builders()
             self.active_address = self.config.active_address
+            # client与发送者在客户端生命周期内不变，预先绑定事务构造参数
+            self._make_txn = partial(SuiTransaction, client=self.client, initial_sender=self.active_address)
             
-            logger.info(f"已连接到Sui网络: {self.config.rpc_url}")
-            logger.info(f"当前活跃地址: {self.active_address}")
+            logger.info("已连接到Sui网络: %s", self.config.rpc_url)
+            logger.info("当前活跃地址: %s", self.active_address)
             
             # 检查连接状态
             self._check_connection()
             
         except Exception as e:
-            logger.error(f"初始化Sui客户端失败: {e}")
+            logger.error("初始化Sui客户端失败: %s", e)
             raise
     
+    def __enter__(self) -> "SuiContractClient":
+        return self
+    
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+    
+    def close(self) -> None:
+        """关闭线程池和底层HTTP连接池"""
+        self._executor.shutdown(wait=True)
+        http_client = getattr(self.client, '_client', None)
+        if http_client is not None:
+            http_client.close()
+    
+    def _install_http_client(self):
+        """
+        为SyncClient换上配置好连接池的HTTP客户端
+        
+        所有builder.execute以及batch_call都经由self.client._client发送，
+        替换后共享同一个有界的keep-alive连接池，并在建连失败时自动重试。
+        安装了h2时启用HTTP/2，节点支持的情况下并发请求复用同一条连接；
+        连接上设置TCP_NODELAY，小请求不受Nagle算法延迟。
+        """
+        default_client = getattr(self.client, '_client', None)
+        if not isinstance(default_client, httpx.Client):
+            return
+        
+        transport_kwargs = dict(
+            http2=_HTTP2_AVAILABLE,
+            retries=HTTP_CONNECT_RETRIES,
+            limits=httpx.Limits(
+                max_connections=HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=max(HTTP_KEEPALIVE_CONNECTIONS, self.pool_size),
+                keepalive_expiry=HTTP_KEEPALIVE_EXPIRY
+            )
+        )
+        try:
+            transport = httpx.HTTPTransport(socket_options=_TCP_NODELAY_OPTIONS, **transport_kwargs)
+        except TypeError:
+            # httpx < 0.24.1 不支持socket_options
+            transport = httpx.HTTPTransport(**transport_kwargs)
+        
+        self.client._client = httpx.Client(
+            timeout=default_client.timeout,
+            headers={"Content-Type": "application/json"},
+            transport=transport
+        )
+        default_client.close()
+    
+    def _resolve_builders(self):
+        """
+        解析当前pysui版本中可用的JSON-RPC builders
+        
+        不同pysui版本提供的builder不尽相同，初始化时解析一次，
+        查询时只需判断对应项是否为None。
+        """
+        self._Builders = SimpleNamespace(
+            balance=getattr(get_builders, 'GetAllCoinBalances', None),
+            coins=getattr(get_builders, 'GetCoins', None),
+            object=getattr(get_builders, 'GetObject', None),
+            tx=getattr(get_builders, 'GetTx', None),
+            multi_tx=getattr(get_builders, 'GetMultipleTx', None),
+        )
+    
     def _check_connection(self):
-        """检查与Sui网络的连接"""
+        """
+        检查与Sui网络的连接
+        
+        同一RPC地址在CONNECTIVITY_TTL秒内检查成功过时直接跳过，
+        避免反复创建客户端时每次都多一次网络往返。
+        """
+        rpc_url = self.config.rpc_url
+        checked_at = self._connectivity_cache.get(rpc_url)
+        if checked_at is not None and time.monotonic() - checked_at < CONNECTIVITY_TTL:
+            logger.debug("跳过连接检查，%s 最近已验证可用", rpc_url)
+            return
+        
         try:
             # 通过获取gas价格来验证连接
             gas_price = self.client.current_gas_price
-            logger.info(f"当前gas价格: {gas_price}")
+            logger.info("当前gas价格: %s", gas_price)
+            self._connectivity_cache[rpc_url] = time.monotonic()
         except Exception as e:
-            logger.error(f"无法连接到Sui网络: {e}")
+            logger.error("无法连接到Sui网络: %s", e)
             raise
     
+    def _cached(self, key: str, loader, ttl: float = GAS_INFO_TTL) -> Any:
+        """返回缓存值，不存在或超过ttl秒时调用loader重新获取"""
+        now = time.monotonic()
+        entry = self._cache.get(key)
+        if entry is not None and now - entry[1] < ttl:
+            return entry[0]
+        value = loader()
+        self._cache[key] = (value, now)
+        return value
+    
+    def _get_max_tx_gas(self, txn: SuiTransaction) -> int:
+        """单笔交易允许的最大gas（带TTL缓存）"""
+        return self._cached('max_tx_gas', lambda: txn.constraints.max_tx_gas)
+    
+    def _prepare_gas(self, txn: SuiTransaction, gas_budget: Optional[int]) -> Dict[str, str]:
+        """
+        确定事务的gas预算
+        
+        调用方已给出gas_budget时直接使用，跳过inspect_for_cost的估算请求；
+        否则估算成本并交由SuiTransaction自动设置预算。
+        
+        Returns:
+            传给txn.execute的关键字参数
+        """
+        # 即将提交事务，缓存的余额随之失效
+        self._cache.pop('balance', None)
+        
+        if gas_budget is not None:
+            try:
+                max_gas = self._get_max_tx_gas(txn)
+                if gas_budget > max_gas:
+                    logger.warning("gas预算 (%s) 超过最大限制 (%s)", gas_budget, max_gas)
+            except Exception as e:
+                logger.warning("获取gas上限失败: %s", e)
+            return {'gas_budget': str(gas_budget)}
+        
+        try:
+            inspect_result = txn.inspect_for_cost()
+            if isinstance(inspect_result, tuple) and len(inspect_result) >= 2:
+                gas_max, gas_min, gas_object_id = inspect_result
+                logger.info("Gas估算 - 最大: %s, 最小: %s mists", gas_max, gas_min)
+                
+                # 检查是否超过最大限制
+                max_gas = self._get_max_tx_gas(txn)
+                if gas_max > max_gas:
+                    logger.warning("估算gas (%s) 超过最大限制 (%s)", gas_max, max_gas)
+            else:
+                logger.info("Gas估算完成，将使用默认预算")
+        except Exception as e:
+            logger.warning("Gas估算失败: %s，将使用默认预算", e)
+        return {}
+    
     def _handle_result(self, result: SuiRpcResult, operation: str) -> Dict[str, Any]:
         """
         处理RPC调用结果
@@ -103,151 +387,218 @@ class SuiContractClient:
             Exception: 当操作失败时抛出异常
         """
         if result.is_ok():
-            logger.info(f"{operation} 执行成功")
-            if hasattr(result.result_data, 'to_json'):
-                return json.loads(result.result_data.to_json())
-            else:
-                return result.result_data
+            logger.info("%s 执行成功", operation)
+            return self._to_plain(result.result_data)
         else:
             error_msg = f"{operation} 执行失败: {result.result_string}"
             logger.error(error_msg)
             if result.result_data:
-                logger.error(f"错误详情: {result.result_data}")
+                logger.error("错误详情: %s", result.result_data)
             raise Exception(error_msg)
     
-    def get_account_balance(self) -> Dict[str, Any]:
+    @classmethod
+    def _to_plain(cls, data: Any) -> Any:
+        """
+        将pysui结果对象转换为与JSON响应一致的字典
+        
+        每种结果类型只在第一次出现时探测一次转换方式，之后直接查表调用。
+        """
+        data_type = type(data)
+        converter = cls._plain_converters.get(data_type)
+        if converter is None:
+            converter = cls._plain_converters[data_type] = _resolve_plain_converter(data)
+        return converter(data)
+    
+    def batch_call(self, calls: List[Tuple[str, List[Any]]]) -> List[Any]:
+        """
+        以JSON-RPC批量请求的方式发送多个调用
+        
+        每batch_size个调用合并为一个HTTP请求，复用SyncClient的keep-alive连接。
+        
+        Args:
+            calls: (方法名, 参数列表) 元组的列表
+            
+        Returns:
+            与calls顺序一致的结果列表，单个调用失败时对应位置为 {'error': ...}
+            
+        Raises:
+            Exception: 当整个批量请求被拒绝时抛出异常
+        """
+        results: List[Any] = []
+        for start in range(0, len(calls), self.batch_size):
+            chunk = calls[start:start + self.batch_size]
+            payload = [
+                {"jsonrpc": "2.0", "id": start + i, "method": method, "params": params}
+                for i, (method, params) in enumerate(chunk)
+            ]
+            response = self.client._client.post(
+                self.config.rpc_url,
+                content=_json_dumps(payload),
+                headers={"Content-Type": "application/json"}
+            )
+            response.raise_for_status()
+            replies = _json_loads(response.content)
+            
+            # 服务端拒绝整个批次时返回单个错误对象而不是数组
+            if not isinstance(replies, list):
+                raise Exception(f"批量请求失败: {replies.get('error', replies)}")
+            
+            # 服务端可能打乱响应顺序，按id重新排列
+            by_id = {reply.get('id'): reply for reply in replies}
+            for i in range(len(chunk)):
+                reply = by_id.get(start + i, {'error': '缺少响应'})
+                if 'error' in reply:
+                    results.append({'error': reply['error']})
+                else:
+                    results.append(reply.get('result'))
+        
+        logger.info("批量请求完成: %s 个调用", len(calls))
+        return results
+    
+    def _rpc_call(self, method: str, params: List[Any]) -> Any:
+        """
+        发送单个（非批量）JSON-RPC请求，复用SyncClient的keep-alive连接
+        
+        Raises:
+            Exception: 节点返回错误时抛出异常
+        """
+        response = self.client._client.post(
+            self.config.rpc_url,
+            content=_json_dumps({"jsonrpc": "2.0", "id": 1, "method": method, "params": params}),
+            headers={"Content-Type": "application/json"}
+        )
+        response.raise_for_status()
+        reply = _json_loads(response.content)
+        if 'error' in reply:
+            raise Exception(f"{method} 失败: {reply['error']}")
+        return reply.get('result')
+    
+    def get_account_balance(self, max_age: float = 0) -> Dict[str, Any]:
         """
         获取账户余额信息
         
+        Args:
+            max_age: 大于0时，若max_age秒内已成功查询过则直接返回缓存结果；
+                     本客户端提交事务后缓存自动失效
+        
         Returns:
             包含余额信息的字典
         """
+        if max_age > 0:
+            entry = self._cache.get('balance')
+            if entry is not None and time.monotonic() - entry[1] < max_age:
+                return entry[0]
+        
+        balance_info = self._fetch_account_balance()
+        if 'error' not in balance_info:
+            self._cache['balance'] = (balance_info, time.monotonic())
+        return balance_info
+    
+    def _fetch_account_balance(self) -> Dict[str, Any]:
+        """查询账户余额，失败时返回带error的字典而不抛出异常"""
         try:
-            # 使用JSON RPC方式获取余额 - 使用更直接的方法
-            import pysui.sui.sui_builders.get_builders as get_builders
+            # 方法1：GetAllCoinBalances直接返回各币种汇总余额
+            if self._Builders.balance is not None:
+                result = self.client.execute(self._Builders.balance(owner=self.active_address))
+                if not result.is_ok():
+                    raise RuntimeError(f"GetAllCoinBalances 查询失败: {result.result_string}")
+                total_balance, sui_objects = self._summarize_balances(getattr(result.result_data, 'items', None))
             
-            # 使用实际存在的builders
-            try:
-                # 方法1：尝试使用GetAllCoinBalances（实际存在）
-                if hasattr(get_builders, 'GetAllCoinBalances'):
-                    builder = get_builders.GetAllCoinBalances(owner=self.active_address)
-                    result = self.client.execute(builder)
-                    
-                    if not result.is_ok():
-                        logger.error(f"GetAllCoinBalances 查询失败: {result.result_string}")
-                        return {
-                            'total_balance_mists': 0,
-                            'total_balance_sui': 0.0,
-                            'sui_objects': [],
-                            'active_address': str(self.active_address),
-                            'error': result.result_string
-                        }
-                    
-                    # 直接使用result.result_data，这是CoinBalances对象
-                    balance_data = result.result_data
-                    total_balance = 0
-                    sui_objects = []
-                    
-                    # 处理CoinBalances对象
-                    if hasattr(balance_data, 'items') and balance_data.items:
-                        for balance_item in balance_data.items:
-                            if hasattr(balance_item, 'coin_type') and balance_item.coin_type == '0x2::sui::SUI':
-                                total_balance = int(balance_item.total_balance)
-                                coin_count = getattr(balance_item, 'coin_object_count', 0)
-                                sui_objects.append({
-                                    'coin_count': coin_count,
-                                    'total_balance': total_balance,
-                                    'coin_type': balance_item.coin_type
-                                })
-                                break
-                    
-                    logger.info(f"账户总余额: {total_balance / 1_000_000_000} SUI")
-                    
-                    return {
-                        'total_balance_mists': total_balance,
-                        'total_balance_sui': total_balance / 1_000_000_000,
-                        'sui_objects': sui_objects,
-                        'active_address': str(self.active_address)
-                    }
-                
-                # 方法2：使用GetCoins（已确认存在）
-                elif hasattr(get_builders, 'GetCoins'):
-                    builder = get_builders.GetCoins(
-                        owner=self.active_address,
-                        coin_type="0x2::sui::SUI"
-                    )
-                    result = self.client.execute(builder)
-                    
-                    if not result.is_ok():
-                        logger.error(f"GetCoins 查询失败: {result.result_string}")
-                        return {
-                            'total_balance_mists': 0,
-                            'total_balance_sui': 0.0,
-                            'sui_objects': [],
-                            'active_address': str(self.active_address),
-                            'error': result.result_string
-                        }
-                    
-                    # 直接使用result.result_data，这是SuiCoinObjects对象
-                    coin_data = result.result_data
-                    total_balance = 0
-                    sui_objects = []
-                    
-                    # 处理SuiCoinObjects对象
-                    if hasattr(coin_data, 'data') and coin_data.data:
-                        for coin in coin_data.data:
-                            if hasattr(coin, 'balance'):
-                                balance = int(coin.balance)
-                                total_balance += balance
-                                sui_objects.append({
-                                    'object_id': getattr(coin, 'coin_object_id', ''),
-                                    'balance': balance,
-                                    'version': getattr(coin, 'version', ''),
-                                    'digest': getattr(coin, 'digest', ''),
-                                    'coin_type': getattr(coin, 'coin_type', '0x2::sui::SUI')
-                                })
-                    
-                    logger.info(f"账户总余额: {total_balance / 1_000_000_000} SUI")
-                    
-                    return {
-                        'total_balance_mists': total_balance,
-                        'total_balance_sui': total_balance / 1_000_000_000,
-                        'sui_objects': sui_objects,
-                        'active_address': str(self.active_address)
-                    }
-                
-                else:
-                    # 方法4：如果所有builder都不存在，返回基础信息
-                    logger.warning("未找到合适的余额查询builder，返回基础信息")
-                    return {
-                        'total_balance_mists': 0,
-                        'total_balance_sui': 0.0,
-                        'sui_objects': [],
-                        'active_address': str(self.active_address),
-                        'note': '需要更新pysui版本或使用GraphQL接口查询余额'
-                    }
-                    
-            except Exception as builder_error:
-                logger.warning(f"Builder执行失败: {builder_error}, 尝试备选方案")
-                # 备选方案：返回基础信息
-                return {
-                    'total_balance_mists': 0,
-                    'total_balance_sui': 0.0,
-                    'sui_objects': [],
-                    'active_address': str(self.active_address),
-                    'note': f'余额查询失败: {builder_error}'
-                }
+            # 方法2：GetCoins按页遍历SUI币对象并累加
+            elif self._Builders.coins is not None:
+                total_balance, sui_objects = self._summarize_coins(self.iter_sui_coins())
             
+            else:
+                logger.warning("未找到合适的余额查询builder，返回基础信息")
+                return self._shape_balance(self.active_address, 0, [],
+                                           note='需要更新pysui版本或使用GraphQL接口查询余额')
         except Exception as e:
-            logger.error(f"获取账户余额失败: {e}")
+            logger.error("获取账户余额失败: %s", e)
             # 不抛出异常，返回错误信息
-            return {
-                'total_balance_mists': 0,
-                'total_balance_sui': 0.0,
-                'sui_objects': [],
-                'active_address': str(self.active_address),
-                'error': str(e)
-            }
+            return self._shape_balance(self.active_address, 0, [], error=str(e))
+        
+        logger.info("账户总余额: %s SUI", total_balance / 1_000_000_000)
+        return self._shape_balance(self.active_address, total_balance, sui_objects)
+    
+    @staticmethod
+    def _shape_balance(address: Any, total_balance: int, sui_objects: List[Dict[str, Any]],
+                       **extra: str) -> Dict[str, Any]:
+        """构造余额查询的返回字典，extra用于附加error/note"""
+        return {
+            'total_balance_mists': total_balance,
+            'total_balance_sui': total_balance / 1_000_000_000,
+            'sui_objects': sui_objects,
+            'active_address': str(address),
+            **extra
+        }
+    
+    @staticmethod
+    def _summarize_balances(items: Any) -> Tuple[int, List[Dict[str, Any]]]:
+        """从GetAllCoinBalances的CoinBalances条目中取出SUI余额"""
+        for balance_item in items or ():
+            if getattr(balance_item, 'coin_type', None) == SUI_COIN_TYPE:
+                total_balance = int(balance_item.total_balance)
+                return total_balance, [{
+                    'coin_count': getattr(balance_item, 'coin_object_count', 0),
+                    'total_balance': total_balance,
+                    'coin_type': SUI_COIN_TYPE
+                }]
+        return 0, []
+    
+    @staticmethod
+    def _summarize_coins(coins: Iterator[Any]) -> Tuple[int, List[Dict[str, Any]]]:
+        """累加SuiCoinObject的余额"""
+        total_balance = 0
+        sui_objects = []
+        for coin in coins:
+            object_id, version, digest, coin_type, balance = _coin_fields(coin)
+            balance = int(balance)
+            total_balance += balance
+            sui_objects.append({
+                'object_id': object_id,
+                'balance': balance,
+                'version': version,
+                'digest': digest,
+                'coin_type': coin_type
+            })
+        return total_balance, sui_objects
+    
+    def iter_sui_coins(self, page_size: int = 50) -> Iterator[Any]:
+        """
+        逐页遍历活跃地址持有的SUI币对象
+        
+        通过GetCoins的cursor分页读取，每次只请求并持有一页数据，
+        适合持有大量币对象的地址。
+        
+        Args:
+            page_size: 每页请求的币对象数量
+            
+        Yields:
+            SuiCoinObject对象
+            
+        Raises:
+            RuntimeError: 当某一页查询失败时抛出异常
+        """
+        cursor = None
+        while True:
+            builder = self._Builders.coins(
+                owner=self.active_address,
+                coin_type=SUI_COIN_TYPE,
+                cursor=cursor,
+                limit=SuiInteger(page_size)
+            )
+            result = self.client.execute(builder)
+            if not result.is_ok():
+                raise RuntimeError(result.result_string)
+            
+            page = result.result_data
+            yield from getattr(page, 'data', None) or []
+            
+            next_cursor = getattr(page, 'next_cursor', None)
+            if not getattr(page, 'has_next_page', False) or not next_cursor:
+                break
+            # 分页游标是不透明的字符串，原样传回
+            cursor = next_cursor
     
     def deploy_contract(self, 
                        package_path: str, 
@@ -265,7 +616,7 @@ class SuiContractClient:
             包含部署结果的字典，包括包ID和UpgradeCap对象ID
         """
         try:
-            logger.info(f"开始部署合约: {package_path}")
+            logger.info("开始部署合约: %s", package_path)
             
             # 验证包路径
             pkg_path = Path(package_path)
@@ -277,79 +628,20 @@ class SuiContractClient:
             if not move_toml.exists():
                 raise FileNotFoundError(f"在 {package_path} 中未找到Move.toml文件")
             
-            # 导入正确的SuiTransaction
-            from pysui.sui.sui_txn.sync_transaction import SuiTransaction
-            
-            # 创建事务
-            txn = SuiTransaction(
-                client=self.client,
-                initial_sender=self.active_address
-            )
-            
-            # 添加发布命令
+            # 先编译，再以编译产物提交发布事务
             logger.info("编译和准备合约...")
-            upgrade_cap = txn.publish(
-                project_path=str(pkg_path),
-                args_list=build_args or []
-            )
-            
-            # 将UpgradeCap转移给发送者
-            txn.transfer_objects(
-                transfers=[upgrade_cap],
-                recipient=self.active_address
-            )
-            
-            # SuiTransaction会自动处理gas预算，我们只需要检查估算成本
-            try:
-                inspect_result = txn.inspect_for_cost()
-                if isinstance(inspect_result, tuple) and len(inspect_result) >= 2:
-                    gas_max, gas_min, gas_object_id = inspect_result
-                    logger.info(f"Gas估算 - 最大: {gas_max}, 最小: {gas_min} mists")
-                    
-                    # 检查是否超过最大限制
-                    max_gas = txn.constraints.max_tx_gas
-                    if gas_max > max_gas:
-                        logger.warning(f"估算gas ({gas_max}) 超过最大限制 ({max_gas})")
-                else:
-                    logger.info("Gas估算完成，将使用默认预算")
-                    
-            except Exception as e:
-                logger.warning(f"Gas估算失败: {e}，将使用默认预算")
+            modules, dependencies = self._compile(str(pkg_path), build_args)
+            deployment_info = self._submit_publish(modules, dependencies, gas_budget)
             
-            # 执行事务
-            logger.info("提交部署事务...")
-            result = txn.execute()
-            deploy_data = self._handle_result(result, "合约部署")
-            
-            # 提取关键信息
-            package_id = None
-            upgrade_cap_id = None
-            
-            if 'objectChanges' in deploy_data:
-                for change in deploy_data['objectChanges']:
-                    if change.get('type') == 'published':
-                        package_id = change.get('packageId')
-                    elif change.get('type') == 'created' and '::package::UpgradeCap' in change.get('objectType', ''):
-                        upgrade_cap_id = change.get('objectId')
-            
-            deployment_info = {
-                'package_id': package_id,
-                'upgrade_cap_id': upgrade_cap_id,
-                'transaction_hash': deploy_data.get('digest'),
-                'gas_used': deploy_data.get('effects', {}).get('gasUsed'),
-                'status': deploy_data.get('effects', {}).get('status'),
-                'full_result': deploy_data
-            }
-            
-            logger.info(f"合约部署成功!")
-            logger.info(f"包ID: {package_id}")
-            logger.info(f"UpgradeCap ID: {upgrade_cap_id}")
-            logger.info(f"事务哈希: {deployment_info['transaction_hash']}")
+            logger.info("合约部署成功!")
+            logger.info("包ID: %s", deployment_info['package_id'])
+            logger.info("UpgradeCap ID: %s", deployment_info['upgrade_cap_id'])
+            logger.info("事务哈希: %s", deployment_info['transaction_hash'])
             
             return deployment_info
             
         except Exception as e:
-            logger.error(f"合约部署失败: {e}")
+            logger.error("合约部署失败: %s", e)
             raise
     
     def call_contract_function(self,
@@ -374,39 +666,16 @@ class SuiContractClient:
             包含调用结果的字典
         """
         try:
-            logger.info(f"调用合约函数: {package_id}::{module_name}::{function_name}")
-            
-            # 导入正确的SuiTransaction
-            from pysui.sui.sui_txn.sync_transaction import SuiTransaction
+            logger.info("调用合约函数: %s::%s::%s", package_id, module_name, function_name)
             
             # 创建事务
-            txn = SuiTransaction(
-                client=self.client,
-                initial_sender=self.active_address
-            )
+            txn = self._make_txn()
             
             # 构建目标字符串
             target = f"{package_id}::{module_name}::{function_name}"
             
             # 处理参数
-            processed_args = []
-            if arguments:
-                for arg in arguments:
-                    if isinstance(arg, str):
-                        # 检查是否是对象ID
-                        if len(arg) == 66 and arg.startswith('0x'):
-                            processed_args.append(ObjectID(arg))
-                        else:
-                            processed_args.append(SuiString(arg))
-                    elif isinstance(arg, bytes):
-                        # 将bytes转换为list[int]用于vector<u8>
-                        processed_args.append(list(arg))
-                    elif isinstance(arg, int):
-                        processed_args.append(SuiU64(arg))
-                    elif isinstance(arg, bool):
-                        processed_args.append(arg)
-                    else:
-                        processed_args.append(arg)
+            processed_args = _convert_args(arguments)
             
             # 调用合约函数
             result_refs = txn.move_call(
@@ -415,40 +684,219 @@ class SuiContractClient:
                 type_arguments=type_arguments or []
             )
             
-            # 检查执行成本（SuiTransaction会自动处理gas预算）
-            try:
-                inspect_result = txn.inspect_for_cost()
-                if isinstance(inspect_result, tuple) and len(inspect_result) >= 2:
-                    gas_max, gas_min, gas_object_id = inspect_result
-                    logger.info(f"Gas估算 - 最大: {gas_max}, 最小: {gas_min} mists")
-                else:
-                    logger.info("Gas估算完成，将使用默认预算")
-            except Exception as e:
-                logger.warning(f"Gas估算失败: {e}，将使用默认预算")
+            # 未指定gas预算时估算成本，由SuiTransaction自动处理预算
+            execute_kwargs = self._prepare_gas(txn, gas_budget)
             
             # 执行事务
             logger.info("提交函数调用事务...")
-            result = txn.execute()
-            call_data = self._handle_result(result, "合约函数调用")
-            
-            call_info = {
-                'transaction_hash': call_data.get('digest'),
-                'gas_used': call_data.get('effects', {}).get('gasUsed'),
-                'status': call_data.get('effects', {}).get('status'),
-                'events': call_data.get('events', []),
-                'object_changes': call_data.get('objectChanges', []),
-                'full_result': call_data
-            }
+            result = txn.execute(**execute_kwargs)
+            call_info = self._call_info(self._handle_result(result, "合约函数调用"))
             
-            logger.info(f"合约函数调用成功!")
-            logger.info(f"事务哈希: {call_info['transaction_hash']}")
+            logger.info("合约函数调用成功!")
+            logger.info("事务哈希: %s", call_info['transaction_hash'])
             
             return call_info
             
         except Exception as e:
-            logger.error(f"合约函数调用失败: {e}")
+            logger.error("合约函数调用失败: %s", e)
             raise
     
+    @staticmethod
+    def _call_info(call_data: Dict[str, Any]) -> Dict[str, Any]:
+        """从事务执行结果中提取调用信息"""
+        return {
+            'transaction_hash': call_data.get('digest'),
+            'gas_used': call_data.get('effects', {}).get('gasUsed'),
+            'status': call_data.get('effects', {}).get('status'),
+            'events': call_data.get('events', []),
+            'object_changes': call_data.get('objectChanges', []),
+            'full_result': call_data
+        }
+    
+    @contextmanager
+    def ptb_batch(self, gas_budget: Optional[int] = None) -> Iterator["PTBBatch"]:
+        """
+        在同一个可编程交易块(PTB)中合并多个合约函数调用
+        
+        with块内的move_call只记录命令，正常退出时一次性提交；
+        块内抛出异常时不提交。整个PTB只产生一笔交易和一份gas费用。
+        
+        用法：
+            with client.ptb_batch() as batch:
+                batch.move_call(package_id, "hello_world", "create_counter")
+                batch.move_call(package_id, "hello_world", "create_greeting", [b"hi"])
+            print(batch.result['transaction_hash'])
+        
+        Args:
+            gas_budget: Gas预算，不提供时自动估算
+        """
+        batch = PTBBatch(self)
+        yield batch
+        if batch.commands:
+            batch.result = batch.submit(gas_budget)
+    
+    def _run_parallel(self, func, items: List[Any], operation: str) -> List[Dict[str, Any]]:
+        """在线程池中并发执行func，单项失败时以{'error': ...}占位，保持与items相同的顺序"""
+        def run_one(item):
+            try:
+                return func(item)
+            except Exception as e:
+                return {'error': str(e)}
+        
+        results = list(self._executor.map(run_one, items))
+        failed = sum(1 for r in results if 'error' in r)
+        logger.info("%s 完成: 成功 %s, 失败 %s", operation, len(results) - failed, failed)
+        return results
+    
+    def _compile(self, package_path: str,
+                 build_args: Optional[List[str]] = None) -> Tuple[List[List[int]], List[str]]:
+        """
+        执行sui move build --dump-bytecode-as-base64，返回 (模块字节码列表, 依赖包ID列表)
+        
+        与pysui的SuiTransaction.publish一致，模块字节码以list[int]形式交给事务构建器。
+        
+        Raises:
+            RuntimeError: 编译失败或输出无法解析时抛出异常
+        """
+        sui_binary = str(getattr(self.config, 'sui_binary', None) or "sui")
+        completed = subprocess.run(
+            [sui_binary, "move", "build", "--dump-bytecode-as-base64",
+             "--path", str(package_path), *(build_args or [])],
+            capture_output=True,
+            text=True
+        )
+        if completed.returncode != 0:
+            detail = (completed.stderr or completed.stdout).strip() or f"退出码 {completed.returncode}"
+            raise RuntimeError(f"sui move build 失败 {package_path}: {detail}")
+        
+        # 编译日志可能混在stdout中，字节码JSON位于最后一行
+        lines = [line for line in completed.stdout.splitlines() if line.strip()]
+        if not lines:
+            raise RuntimeError(f"sui move build 未输出字节码: {package_path}")
+        compiled = _json_loads(lines[-1])
+        modules = [list(base64.b64decode(module)) for module in compiled.get('modules') or []]
+        return modules, list(compiled.get('dependencies') or [])
+    
+    def _submit_publish(self, modules: List[List[int]], dependencies: List[str],
+                        gas_budget: Optional[int] = None) -> Dict[str, Any]:
+        """
+        以已编译的模块提交发布事务，并将UpgradeCap转移给发送者
+        
+        Returns:
+            包含包ID、UpgradeCap对象ID与事务信息的字典
+        """
+        txn = self._make_txn()
+        upgrade_cap = txn.builder.publish(
+            modules, [bcs.Address.from_str(dep) for dep in dependencies]
+        )
+        
+        # 将UpgradeCap转移给发送者
+        txn.transfer_objects(
+            transfers=[upgrade_cap],
+            recipient=self.active_address
+        )
+        
+        # 未指定gas预算时估算成本，由SuiTransaction自动处理预算
+        execute_kwargs = self._prepare_gas(txn, gas_budget)
+        
+        # 执行事务
+        logger.info("提交部署事务...")
+        result = txn.execute(**execute_kwargs)
+        deploy_data = self._handle_result(result, "合约部署")
+        
+        # 提取关键信息
+        package_id = None
+        upgrade_cap_id = None
+        
+        # 单次遍历，两个ID都找到后立即停止
+        for change in deploy_data.get('objectChanges') or ():
+            change_type = change.get('type')
+            if change_type == 'published' and package_id is None:
+                package_id = change.get('packageId')
+            elif (change_type == 'created' and upgrade_cap_id is None
+                  and change.get('objectType', '').endswith(UPGRADE_CAP_SUFFIX)):
+                upgrade_cap_id = change.get('objectId')
+            if package_id and upgrade_cap_id:
+                break
+        
+        return {
+            'package_id': package_id,
+            'upgrade_cap_id': upgrade_cap_id,
+            'transaction_hash': deploy_data.get('digest'),
+            'gas_used': deploy_data.get('effects', {}).get('gasUsed'),
+            'status': deploy_data.get('effects', {}).get('status'),
+            'full_result': deploy_data
+        }
+    
+    def deploy_contracts(self,
+                         paths: List[str],
+                         gas_budget: Optional[int] = None,
+                         build_args: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """
+        部署多个合约包：先并发编译，再依次提交发布事务
+        
+        Move编译是耗时最长的一步且各包之间互不依赖，在线程池中并发执行；
+        编译产物直接交给发布事务，不再重复编译。事务按顺序提交，
+        避免同一发送者的事务争用gas币。
+        
+        Args:
+            paths: Move包路径列表
+            gas_budget: 每笔发布事务的gas预算
+            build_args: 额外的构建参数
+            
+        Returns:
+            与paths顺序一致的部署结果列表，失败项为{'error': ...}
+        """
+        def compile_one(path: str) -> Any:
+            try:
+                return self._compile(path, build_args)
+            except Exception as e:
+                logger.error("合约编译失败 %s: %s", path, e)
+                return e
+        
+        compiled = list(self._executor.map(compile_one, paths))
+        
+        results = []
+        for path, package in zip(paths, compiled):
+            if isinstance(package, Exception):
+                results.append({'error': str(package)})
+                continue
+            try:
+                logger.info("开始部署合约: %s", path)
+                results.append(self._submit_publish(*package, gas_budget=gas_budget))
+            except Exception as e:
+                logger.error("合约部署失败 %s: %s", path, e)
+                results.append({'error': str(e)})
+        return results
+    
+    def deploy_contracts_parallel(self, paths: List[str]) -> List[Dict[str, Any]]:
+        """
+        并发部署多个合约包
+        
+        注意：同一发送者的并发事务可能选中同一个gas币而相互冲突，
+        建议活跃地址持有多个gas币对象时再使用。
+        
+        Args:
+            paths: Move包路径列表
+            
+        Returns:
+            与paths顺序一致的部署结果列表，失败项为{'error': ...}
+        """
+        return self._run_parallel(self.deploy_contract, paths, "批量合约部署")
+    
+    def call_contract_functions_parallel(self, calls: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        并发调用多个合约函数
+        
+        Args:
+            calls: 每项为call_contract_function的关键字参数字典
+            
+        Returns:
+            与calls顺序一致的调用结果列表，失败项为{'error': ...}
+        """
+        return self._run_parallel(lambda kwargs: self.call_contract_function(**kwargs),
+                                  calls, "批量合约函数调用")
+    
     def get_object_info(self, object_id: str) -> Dict[str, Any]:
         """
         获取对象信息
@@ -460,13 +908,11 @@ class SuiContractClient:
             对象信息字典
         """
         try:
-            import pysui.sui.sui_builders.get_builders as get_builders
-            
             # 尝试使用GetObject builder
-            if hasattr(get_builders, 'GetObject'):
-                builder = get_builders.GetObject(
+            if self._Builders.object is not None:
+                builder = self._Builders.object(
                     object_id=ObjectID(object_id),
-                    options={"showType": True, "showContent": True, "showOwner": True}
+                    options=OBJECT_QUERY_OPTIONS
                 )
                 
                 result = self.client.execute(builder)
@@ -482,7 +928,7 @@ class SuiContractClient:
                 }
             
         except Exception as e:
-            logger.error(f"获取对象信息失败: {e}")
+            logger.error("获取对象信息失败: %s", e)
             return {
                 'object_id': object_id,
                 'error': str(e)
@@ -499,18 +945,11 @@ class SuiContractClient:
             交易信息字典
         """
         try:
-            import pysui.sui.sui_builders.get_builders as get_builders
-            
             # 使用实际存在的transaction builder
-            if hasattr(get_builders, 'GetTx'):
-                builder = get_builders.GetTx(
+            if self._Builders.tx is not None:
+                builder = self._Builders.tx(
                     digest=tx_hash,
-                    options={
-                        "showInput": True,
-                        "showEffects": True,
-                        "showEvents": True,
-                        "showObjectChanges": True
-                    }
+                    options=TRANSACTION_QUERY_OPTIONS
                 )
                 
                 result = self.client.execute(builder)
@@ -519,15 +958,10 @@ class SuiContractClient:
                 return tx_data
             
             # 备选方案：尝试GetMultipleTx
-            elif hasattr(get_builders, 'GetMultipleTx'):
-                builder = get_builders.GetMultipleTx(
+            elif self._Builders.multi_tx is not None:
+                builder = self._Builders.multi_tx(
                     digests=[tx_hash],
-                    options={
-                        "showInput": True,
-                        "showEffects": True,
-                        "showEvents": True,
-                        "showObjectChanges": True
-                    }
+                    options=TRANSACTION_QUERY_OPTIONS
                 )
                 
                 result = self.client.execute(builder)
@@ -546,11 +980,224 @@ class SuiContractClient:
                 }
             
         except Exception as e:
-            logger.error(f"获取交易信息失败: {e}")
+            logger.error("获取交易信息失败: %s", e)
             return {
                 'transaction_hash': tx_hash,
                 'error': str(e)
             }
+    
+    def _multi_get(self, method: str, ids: List[str], options: Dict[str, bool], operation: str) -> List[Any]:
+        """
+        通过Sui原生的multiGet方法查询多个对象或交易
+        
+        ids按MULTI_GET_LIMIT分段，各段作为同一个批量请求中的多个调用发送。
+        """
+        ids = list(ids)
+        calls = [
+            (method, [ids[start:start + MULTI_GET_LIMIT], options])
+            for start in range(0, len(ids), MULTI_GET_LIMIT)
+        ]
+        items: List[Any] = []
+        for result in self.batch_call(calls):
+            if isinstance(result, dict) and 'error' in result:
+                raise Exception(f"{operation} 执行失败: {result['error']}")
+            items.extend(result)
+        logger.info("%s 执行成功", operation)
+        return items
+    
+    def get_account_balances(self, addresses: List[str]) -> List[Dict[str, Any]]:
+        """
+        批量获取多个地址的SUI余额
+        
+        每个地址一个suix_getAllBalances调用，合并为JSON-RPC批量请求发送。
+        
+        Args:
+            addresses: 地址列表
+            
+        Returns:
+            与addresses顺序一致的余额信息字典列表，结构与get_account_balance一致
+        """
+        try:
+            results = self.batch_call([("suix_getAllBalances", [str(address)]) for address in addresses])
+        except Exception as e:
+            logger.error("批量获取账户余额失败: %s", e)
+            results = [{'error': str(e)}] * len(addresses)
+        
+        balances = []
+        for address, result in zip(addresses, results):
+            if isinstance(result, dict) and 'error' in result:
+                balances.append(self._shape_balance(address, 0, [], error=str(result['error'])))
+                continue
+            
+            total_balance = 0
+            sui_objects = []
+            for item in result or []:
+                if item.get('coinType') == SUI_COIN_TYPE:
+                    total_balance = int(item.get('totalBalance', 0))
+                    sui_objects.append({
+                        'coin_count': item.get('coinObjectCount', 0),
+                        'total_balance': total_balance,
+                        'coin_type': SUI_COIN_TYPE
+                    })
+                    break
+            balances.append(self._shape_balance(address, total_balance, sui_objects))
+        return balances
+    
+    def deploy_preflight(self) -> Dict[str, Any]:
+        """
+        部署前检查：余额、参考gas价格与可用gas对象合并为一次JSON-RPC批量请求，
+        复用已建立的连接
+        
+        Returns:
+            包含余额、参考gas价格、可用gas对象与活跃地址的字典
+            
+        Raises:
+            Exception: 任一查询失败时抛出
+        """
+        address = str(self.active_address)
+        replies = self.batch_call([
+            ("suix_getAllBalances", [address]),
+            ("suix_getReferenceGasPrice", []),
+            ("suix_getCoins", [address, SUI_COIN_TYPE, None, 1]),
+        ])
+        for reply in replies:
+            if isinstance(reply, dict) and 'error' in reply:
+                raise Exception(f"部署前检查失败: {reply['error']}")
+        balances, gas_price, coins_page = replies
+        coins = (coins_page or {}).get('data') or []
+        
+        total_balance = 0
+        for balance in balances or []:
+            if balance.get('coinType') == SUI_COIN_TYPE:
+                total_balance = int(balance.get('totalBalance', 0))
+                break
+        
+        return {
+            'total_balance_mists': total_balance,
+            'total_balance_sui': total_balance / 1_000_000_000,
+            'reference_gas_price': int(gas_price),
+            'gas_object': coins[0] if coins else None,
+            'active_address': address
+        }
+    
+    def get_object_infos(self, object_ids: List[str]) -> List[Dict[str, Any]]:
+        """
+        批量获取对象信息
+        
+        使用sui_multiGetObjects在一次请求中查询全部对象。
+        
+        Args:
+            object_ids: 对象ID列表
+            
+        Returns:
+            与object_ids顺序一致的对象信息字典列表
+        """
+        try:
+            return self._multi_get("sui_multiGetObjects", object_ids, OBJECT_QUERY_OPTIONS,
+                                   f"批量获取对象信息 ({len(object_ids)} 个)")
+        except Exception as e:
+            logger.error("批量获取对象信息失败: %s", e)
+            return [{'object_id': object_id, 'error': str(e)} for object_id in object_ids]
+    
+    def get_transaction_infos(self, tx_hashes: List[str]) -> List[Dict[str, Any]]:
+        """
+        批量获取交易信息
+        
+        使用sui_multiGetTransactionBlocks在一次请求中查询全部交易。
+        
+        Args:
+            tx_hashes: 交易哈希列表
+            
+        Returns:
+            与tx_hashes顺序一致的交易信息字典列表
+        """
+        try:
+            return self._multi_get("sui_multiGetTransactionBlocks", tx_hashes, TRANSACTION_QUERY_OPTIONS,
+                                   f"批量获取交易信息 ({len(tx_hashes)} 个)")
+        except Exception as e:
+            logger.error("批量获取交易信息失败: %s", e)
+            return [{'transaction_hash': tx_hash, 'error': str(e)} for tx_hash in tx_hashes]
+    
+    def wait_for_transaction(self, tx_hash: str, initial: float = 0.5, cap: float = 3.5,
+                             timeout: float = 30.0) -> Dict[str, Any]:
+        """
+        轮询交易直到执行结果为success或failure
+        
+        轮询间隔从initial开始按指数增长，上限为cap；交易尚未被节点索引时继续等待，
+        其余错误直接抛出。
+        
+        Returns:
+            带effects的交易信息字典
+            
+        Raises:
+            TimeoutError: 超过timeout秒仍未得到最终状态
+        """
+        deadline = time.monotonic() + timeout
+        delay = initial
+        while True:
+            try:
+                tx = self._rpc_call("sui_getTransactionBlock", [tx_hash, {"showEffects": True}])
+                if ((tx or {}).get('effects') or {}).get('status', {}).get('status') in ('success', 'failure'):
+                    return tx
+            except Exception as e:
+                # 交易尚未被节点索引时继续等待
+                if 'Could not find' not in str(e) and 'not found' not in str(e).lower():
+                    raise
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError(f"等待交易 {tx_hash} 超时（{timeout}s）")
+            time.sleep(min(delay, remaining))
+            delay = min(delay * 2, cap)
+
+
+class PTBBatch:
+    """
+    ptb_batch()使用的批量调用构建器
+    
+    所有move_call写入同一个SuiTransaction，提交后的结果保存在result中，
+    commands按添加顺序记录每条命令的调用目标。
+    """
+    
+    def __init__(self, client: SuiContractClient):
+        self._client = client
+        self._txn = client._make_txn()
+        self.commands: List[str] = []
+        self.result: Optional[Dict[str, Any]] = None
+    
+    def move_call(self,
+                  package_id: str,
+                  module_name: str,
+                  function_name: str,
+                  arguments: Optional[List[Any]] = None,
+                  type_arguments: Optional[List[str]] = None) -> Any:
+        """
+        追加一条合约函数调用命令
+        
+        Returns:
+            该命令的结果引用，可作为后续命令的参数
+        """
+        target = f"{package_id}::{module_name}::{function_name}"
+        self.commands.append(target)
+        return self._txn.move_call(
+            target=target,
+            arguments=_convert_args(arguments),
+            type_arguments=type_arguments or []
+        )
+    
+    def submit(self, gas_budget: Optional[int] = None) -> Dict[str, Any]:
+        """提交全部命令，返回与call_contract_function相同结构的调用信息"""
+        client = self._client
+        try:
+            execute_kwargs = client._prepare_gas(self._txn, gas_budget)
+            logger.info("提交PTB批量调用事务: %s 条命令", len(self.commands))
+            result = self._txn.execute(**execute_kwargs)
+            call_info = client._call_info(client._handle_result(result, "PTB批量调用"))
+            call_info['commands'] = list(self.commands)
+            logger.info("事务哈希: %s", call_info['transaction_hash'])
+            return call_info
+        except Exception as e:
+            logger.error("PTB批量调用失败: %s", e)
+            raise
 
 
 def main():
@@ -591,7 +1238,7 @@ def main():
         logger.info("\n=== 演示完成 ===")
         
     except Exception as e:
-        logger.error(f"演示过程中发生错误: {e}")
+        logger.error("演示过程中发生错误: %s", e)
         sys.exit(1)
 
 
@@ -17,10 +17,54 @@ Sui 区块链 gRPC 客户端程序
 - 需在 requirements 中安装 `grpcio`（多数情况下 pysui 已处理 protobuf 依赖）。
 """
 
+import asyncio
+import dataclasses
+import inspect
+import itertools
 import logging
+import queue
+import threading
 import sys
 import json
-from typing import Any, Dict, List, Optional
+import operator
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+# pysui 在模块加载时导入一次；缺失时由 SuiGrpcClient.__init__ 给出可读的报错
+try:
+    import pysui.sui.sui_builders.get_builders as _get_builders
+    from pysui import ObjectID
+    from pysui.sui.sui_txn.sync_transaction import SuiTransaction
+    from pysui.sui.sui_types.scalars import SuiU64, SuiString
+except Exception:
+    _get_builders = None
+    ObjectID = SuiTransaction = SuiU64 = SuiString = None
+
+# 优先使用 orjson（C 实现）做 JSON 编解码，不可用时回退到标准库
+try:
+    import orjson
+
+    def _json_roundtrip(obj: Any) -> Any:
+        """最后手段：通用序列化"""
+        return orjson.loads(orjson.dumps(obj, default=str, option=orjson.OPT_NON_STR_KEYS))
+
+    _json_loads = orjson.loads
+except ImportError:
+    orjson = None
+    _json_loads = json.loads
+
+    def _json_roundtrip(obj: Any) -> Any:
+        """最后手段：通用序列化"""
+        return json.loads(json.dumps(obj, default=str))
+
+try:
+    from google.protobuf.json_format import MessageToDict
+    from google.protobuf.message import Message as _ProtoMessage
+except Exception:
+    MessageToDict = None
+    _ProtoMessage = None
 
 # 配置日志
 logging.basicConfig(
@@ -30,10 +74,217 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+SUI_COIN_TYPE = "0x2::sui::SUI"
+
+# 默认的 gRPC 通道数；单条 HTTP/2 连接的并发流通常被服务端限制在约 100 条
+DEFAULT_CHANNEL_POOL_SIZE = 4
+MAX_CONCURRENT_STREAMS = 100
+
+# 合并查询时单个 multiGet 请求最多包含的条目数
+COALESCE_MAX_BATCH = 50
+
+# 合并查询等待结果的最长秒数，避免合并线程退出后调用方永久阻塞
+COALESCE_RESULT_TIMEOUT = 30.0
+
+_OBJECT_OPTIONS = {"showType": True, "showContent": True, "showOwner": True}
+_TX_OPTIONS = {
+    "showInput": True,
+    "showEffects": True,
+    "showEvents": True,
+    "showObjectChanges": True,
+}
+
+# get_transaction_info 的 fields 取值 -> 需要节点返回的部分
+_TX_FIELD_OPTIONS = {
+    'input': "showInput",
+    'effects': "showEffects",
+    'status': "showEffects",
+    'gas_used': "showEffects",
+    'events': "showEvents",
+    'object_changes': "showObjectChanges",
+}
+
+
+# GetCoins 返回的币对象字段，同一响应内的对象结构一致，取值函数只构造一次
+_coin_fields = operator.attrgetter('coin_object_id', 'balance', 'version', 'digest', 'coin_type')
+
+
+def _tx_options(fields: Optional[Iterable[str]]) -> Dict[str, bool]:
+    """把 fields 转换为交易查询选项；fields 为 None 时返回全部字段。"""
+    if fields is None:
+        return _TX_OPTIONS
+    options = dict.fromkeys(_TX_OPTIONS, False)
+    for field in fields:
+        try:
+            options[_TX_FIELD_OPTIONS[field]] = True
+        except KeyError:
+            raise ValueError(f"未知的交易字段: {field}，可选: {sorted(_TX_FIELD_OPTIONS)}") from None
+    return options
+
+
 class GrpcUnavailableError(RuntimeError):
     pass
 
 
+class BatchCall(NamedTuple):
+    """
+    SuiGrpcClient.batch 中的一个调用
+
+    - depends_on < 0：直接执行 builder
+    - depends_on >= 0：等第 depends_on 个调用完成后，执行 transform(该调用的结果) 返回的 builder；
+      depends_on 必须指向列表中更靠前的调用
+    """
+    builder: Any = None
+    depends_on: int = -1
+    transform: Optional[Callable[[Any], Any]] = None
+
+
+def _protobuf_backend() -> Optional[str]:
+    """返回当前生效的 protobuf 实现：'upb' / 'cpp' / 'python'，未安装 protobuf 时返回 None。"""
+    try:
+        from google.protobuf.internal import api_implementation
+    except Exception:
+        return None
+    return api_implementation.Type()
+
+
+def _str_arg(arg: str) -> Any:
+    """0x 开头的字符串尝试作为 ObjectID，失败时作为 SuiString；其余字符串原样传递"""
+    # 先比长度再逐字符比较，不创建切片也不查找 startswith 方法
+    if len(arg) >= 3 and arg[0] == '0' and arg[1] == 'x':
+        try:
+            return ObjectID(arg)
+        except Exception:
+            return SuiString(arg)
+    return arg
+
+
+def _passthrough_arg(arg: Any) -> Any:
+    return arg
+
+
+# 按参数的精确类型分派转换函数；bool 虽是 int 的子类，但按原样传递
+_ARG_DISPATCH: Dict[type, Callable[[Any], Any]] = {
+    str: _str_arg,
+    bytes: list,  # vector<u8> 需要 list[int]
+    int: SuiU64,
+    bool: _passthrough_arg,
+}
+
+
+def _object_id_arg(object_id: Any) -> Any:
+    """对象 ID：已是 ObjectID 时直接使用，不再重复构造与校验"""
+    if isinstance(object_id, ObjectID):
+        return object_id
+    return ObjectID(object_id)
+
+
+def _to_dict_encoded(obj: Any) -> Any:
+    """dataclasses_json / betterproto 模型：直接取字段，键名与 to_json 一致"""
+    try:
+        return obj.to_dict(encode_json=True)
+    except TypeError:
+        return obj.to_dict()
+
+
+def _dataclass_to_dict(obj: Any) -> Any:
+    """普通 dataclass：asdict 后再过一遍通用序列化，保证 bytes/枚举等字段可 JSON 输出"""
+    return _json_roundtrip(dataclasses.asdict(obj))
+
+
+def _message_to_dict(obj: Any) -> Any:
+    """google.protobuf 消息：按描述符直接转字典（JSON 字段名，与 JSON-RPC 返回一致）"""
+    return MessageToDict(obj)
+
+
+def _sequence_to_list(obj: Any) -> Any:
+    return [_to_plain(item) for item in obj]
+
+
+def _identity(obj: Any) -> Any:
+    return obj
+
+
+def _resolve_converter(obj: Any) -> Callable[[Any], Any]:
+    if obj is None or isinstance(obj, (dict, str, int, float, bool)):
+        return _identity
+    if isinstance(obj, (list, tuple)):
+        return _sequence_to_list
+    if _ProtoMessage is not None and isinstance(obj, _ProtoMessage):
+        return _message_to_dict
+    if hasattr(obj, 'to_dict'):
+        return _to_dict_encoded
+    if dataclasses.is_dataclass(obj):
+        return _dataclass_to_dict
+    if hasattr(obj, 'to_json'):
+        return lambda o: _json_loads(o.to_json())
+    return _json_roundtrip
+
+
+# 对象类型 -> 转换函数，每种类型只探测一次
+_converters: Dict[type, Callable[[Any], Any]] = {}
+
+
+def _to_plain(obj: Any) -> Any:
+    """把 pysui/protobuf 返回对象转换为字典，避免先序列化为 JSON 字符串再解析。"""
+    obj_type = type(obj)
+    converter = _converters.get(obj_type)
+    if converter is None:
+        converter = _converters[obj_type] = _resolve_converter(obj)
+    return converter(obj)
+
+
+def _rpc_result_to_dict(result: Any, operation: str) -> Any:
+    """JSON-RPC 风格结果（带 is_ok/result_data）"""
+    if result.is_ok():
+        return _to_plain(getattr(result, 'result_data', None))
+    raise RuntimeError(getattr(result, 'result_string', f"{operation} 失败"))
+
+
+def _model_to_dict(result: Any, operation: str) -> Any:
+    """gRPC：protobuf/模型对象或其他返回值"""
+    return _to_plain(result)
+
+
+# 进程内共享的 gRPC 客户端：(配置路径, gRPC 地址) -> [客户端列表, 引用计数]
+# pysui 自行创建并持有通道，无法注入外部 grpc.Channel，因此在客户端一级共享，
+# 同一进程内后续实例复用已建立的 TLS 连接，不再重复握手。gRPC 通道本身是线程安全的。
+_shared_clients: Dict[Tuple[str, str], List[Any]] = {}
+_shared_clients_lock = threading.Lock()
+
+
+def _acquire_shared_clients(key: Tuple[str, str], size: int, factory: Callable[[], Any]) -> List[Any]:
+    """取得（必要时创建/扩充）共享客户端列表并增加引用计数。"""
+    with _shared_clients_lock:
+        entry = _shared_clients.get(key)
+        if entry is None:
+            entry = _shared_clients[key] = [[], 0]
+        clients = entry[0]
+        while len(clients) < size:
+            clients.append(factory())
+        entry[1] += 1
+        return clients[:size]
+
+
+def _release_shared_clients(key: Tuple[str, str]) -> List[Any]:
+    """减少引用计数；最后一个使用者释放时返回需要关闭的客户端列表，否则返回空列表。"""
+    with _shared_clients_lock:
+        entry = _shared_clients.get(key)
+        if entry is None:
+            return []
+        entry[1] -= 1
+        if entry[1] > 0:
+            return []
+        del _shared_clients[key]
+        return entry[0]
+
+
+def _resolve_result_handler(result: Any) -> Callable[[Any, str], Any]:
+    if hasattr(result, 'is_ok') and callable(result.is_ok):
+        return _rpc_result_to_dict
+    return _model_to_dict
+
+
 class SuiGrpcClient:
     """
     Sui gRPC 客户端
@@ -41,7 +292,26 @@ class SuiGrpcClient:
     依赖 pysui 的 gRPC 支持。
     """
 
-    def __init__(self, config_path: Optional[str] = None):
+    # 结果类型 -> 处理函数，每种类型只探测一次
+    _result_handlers: Dict[type, Callable[[Any, str], Any]] = {}
+
+    # 探测成功的 gRPC 客户端构造方式 (module_path, class_name, uses_transport_kw)，各实例共享
+    _resolved_ctor: Optional[tuple] = None
+
+    def __init__(self, config_path: Optional[str] = None, require_fast_protobuf: bool = False,
+                 pool_size: int = DEFAULT_CHANNEL_POOL_SIZE, coalesce_ms: float = 0,
+                 defer_health_check: bool = False, share_channels: bool = False):
+        """
+        Args:
+            config_path: Sui 配置文件路径，默认使用 default_config()
+            require_fast_protobuf: 为 True 时，若 protobuf 运行在纯 Python 实现上则拒绝初始化
+            pool_size: 底层 gRPC 客户端（通道）数量，只读请求在其间轮转
+            coalesce_ms: 大于 0 时，在该时间窗口内到达的对象/交易查询合并为一次 multiGet 请求
+            defer_health_check: 为 True 时健康检查在后台线程执行，构造函数立即返回，
+                                首次请求时才等待检查结果（检查失败时由该请求抛出 GrpcUnavailableError）
+            share_channels: 为 True 时，同一进程内使用相同配置与节点的实例共享底层 gRPC 客户端，
+                            只有第一个实例进行 TLS 握手；最后一个实例 close 时才真正关闭通道
+        """
         try:
             # 延迟导入，便于给出更可读的错误
             try:
@@ -57,8 +327,37 @@ class SuiGrpcClient:
             else:
                 self.config = SuiConfig.default_config()
 
-            # 检测/创建 gRPC 客户端
-            self._client = self._construct_grpc_client(self.config)
+            # 检测 protobuf 后端：纯 Python 实现的解码速度比 upb/cpp 慢一个数量级
+            self._check_protobuf_backend(require_fast_protobuf)
+
+            # 检测/创建 gRPC 客户端；交易始终使用第一个，只读请求在通道池中轮转
+            pool_size = max(1, pool_size)
+            # 先置空，初始化中途失败时 close 只释放已取得的资源
+            self._shared_key: Optional[Tuple[str, str]] = None
+            self._clients: List[Any] = []
+            self._coalescer: Optional[threading.Thread] = None
+            self._batch_executor: Optional[ThreadPoolExecutor] = None
+            # close 与 _dispatch 共用的锁：关闭后不再接受新的合并查询
+            self._dispatch_lock = threading.Lock()
+            self._closed = False
+            if share_channels:
+                shared_key = (config_path or '', str(getattr(self.config, 'grpc_url', None) or ''))
+                self._clients = _acquire_shared_clients(
+                    shared_key, pool_size, lambda: self._construct_grpc_client(self.config))
+                # 引用计数已增加，此后任何失败都要经 close 归还
+                self._shared_key = shared_key
+            else:
+                self._clients = [self._construct_grpc_client(self.config) for _ in range(pool_size)]
+            self._client = self._clients[0]
+            self._rr = itertools.cycle(self._clients)
+            # batch 各层共用的线程池；并发上限为全部通道可承载的流数，线程按需创建
+            self._batch_executor = ThreadPoolExecutor(
+                max_workers=len(self._clients) * MAX_CONCURRENT_STREAMS, thread_name_prefix="sui-grpc-batch")
+            self._in_flight = 0
+            self._in_flight_lock = threading.Lock()
+            self._resolve_builders()
+            self._start_coalescer(coalesce_ms)
+            self.last_cost: Any = None
 
             # 活跃地址
             self.active_address = self.config.active_address
@@ -69,13 +368,129 @@ class SuiGrpcClient:
             logger.info(f"当前活跃地址: {self.active_address}")
 
             # 健康检查
-            self._check_connection()
+            self._start_health_check(defer_health_check)
         except Exception as e:
             logger.error(f"初始化 Sui gRPC 客户端失败: {e}")
+            # 归还共享通道的引用计数、停止合并线程并关闭已创建的通道
+            if getattr(self, '_clients', None):
+                try:
+                    self.close()
+                except Exception as close_error:
+                    logger.warning(f"初始化失败后清理 gRPC 客户端失败: {close_error}")
             raise
 
+    def __enter__(self) -> "SuiGrpcClient":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """关闭底层 gRPC 通道。通道在客户端生命周期内复用，仅在此处释放；共享通道由最后一个使用者关闭。"""
+        with self._dispatch_lock:
+            self._closed = True
+            coalescer, self._coalescer = self._coalescer, None
+            if coalescer is not None:
+                # 哨兵在锁内入队，之前已入队的查询都会先被处理
+                self._dispatch_queue.put(None)
+        if coalescer is not None:
+            coalescer.join()
+        if self._batch_executor is not None:
+            self._batch_executor.shutdown(wait=True)
+            self._batch_executor = None
+        if self._shared_key is not None:
+            clients = _release_shared_clients(self._shared_key)
+            # 重复调用 close 时不再经由 else 分支关闭仍被其他实例使用的共享通道
+            self._shared_key = None
+            self._clients = []
+        else:
+            clients = self._clients
+        for client in clients:
+            close = getattr(client, 'close', None)
+            if not callable(close):
+                continue
+            try:
+                res = close()
+                # pysui 的 gRPC 客户端可能提供协程形式的 close
+                if inspect.isawaitable(res):
+                    asyncio.run(res)
+            except Exception as e:
+                logger.warning(f"关闭 gRPC 通道失败: {e}")
+
+    def _start_health_check(self, defer: bool) -> None:
+        """立即执行健康检查，或在后台线程中执行并由 _await_health 等待结果。"""
+        self._health_future: Optional[Future] = None
+        if not defer:
+            self._check_connection()
+            return
+
+        future: Future = Future()
+
+        def run() -> None:
+            try:
+                self._check_connection()
+                future.set_result(None)
+            except Exception as e:
+                future.set_exception(e)
+
+        self._health_future = future
+        threading.Thread(target=run, name="sui-grpc-health", daemon=True).start()
+
+    def _await_health(self) -> None:
+        """等待后台健康检查完成；检查失败时抛出其异常。"""
+        future = self._health_future
+        if future is not None:
+            future.result()
+            self._health_future = None
+
+    def _execute(self, builder: Any) -> Any:
+        """在通道池中轮转执行只读 builder，并在并发数超过通道总容量时告警。"""
+        self._await_health()
+        limit = len(self._clients) * MAX_CONCURRENT_STREAMS
+        with self._in_flight_lock:
+            self._in_flight += 1
+            in_flight = self._in_flight
+        try:
+            if in_flight > limit:
+                logger.warning("并发 gRPC 请求数 %s 超过通道池容量 %s，请增大 pool_size", in_flight, limit)
+            return next(self._rr).execute(builder)
+        finally:
+            with self._in_flight_lock:
+                self._in_flight -= 1
+
+    def _check_protobuf_backend(self, strict: bool) -> None:
+        """记录 protobuf 后端；strict 时纯 Python 后端直接报错。"""
+        backend = _protobuf_backend()
+        if backend is None:
+            logger.debug("未检测到 protobuf，跳过后端检查")
+            return
+        logger.info("protobuf 后端: %s", backend)
+        if backend != 'python':
+            return
+
+        hint = (
+            "protobuf 当前使用纯 Python 实现，gRPC 响应解码会明显变慢。请:\n"
+            "- 使用官方二进制 wheel 重新安装: pip install --force-reinstall --only-binary=:all: protobuf\n"
+            "- 确认未设置 PROTOCOL_BUFFERS_PYTHON_IMPLEMENTATION=python\n"
+            "- 若只能从源码构建，需启用 C++ 实现（python setup.py build --cpp_implementation）"
+        )
+        if strict:
+            raise GrpcUnavailableError(hint)
+        logger.warning(hint)
+
     def _construct_grpc_client(self, config: Any) -> Any:
         """构造 pysui gRPC 客户端，兼容不同版本命名。"""
+        # 已探测过构造方式时直接使用；失败（如运行中升级了 pysui）则重新探测
+        resolved = SuiGrpcClient._resolved_ctor
+        if resolved is not None:
+            module_path, class_name, uses_transport_kw = resolved
+            try:
+                cls = getattr(__import__(module_path, fromlist=[class_name]), class_name)
+                return cls(config, transport='grpc') if uses_transport_kw else cls(config)
+            except Exception as e:
+                logger.debug(f"缓存的 gRPC 客户端构造方式失效，重新探测: {e}")
+                SuiGrpcClient._resolved_ctor = None
+
         # 候选路径（根据 pysui 项目演进梳理，按顺序尝试）
         candidate_imports = [
             # 新版可能导出专用 gRPC 同步客户端
@@ -96,12 +511,14 @@ class SuiGrpcClient:
                     # 优先直接使用 GrpcClient(config)
                     client = cls(config)
                     logger.debug(f"使用 {module_path}.{class_name} 作为 gRPC 客户端")
+                    SuiGrpcClient._resolved_ctor = (module_path, class_name, False)
                     return client
                 except TypeError:
                     # 可能是 SyncClient(config, transport='grpc') 这类签名
                     try:
                         client = cls(config, transport='grpc')
                         logger.debug(f"使用 {module_path}.{class_name}(transport='grpc') 作为 gRPC 客户端")
+                        SuiGrpcClient._resolved_ctor = (module_path, class_name, True)
                         return client
                     except Exception as e2:
                         last_err = e2
@@ -119,28 +536,151 @@ class SuiGrpcClient:
         )
         raise GrpcUnavailableError(hint + (f"\n最后错误: {last_err}" if last_err else ""))
 
+    def _resolve_builders(self) -> None:
+        """解析当前 pysui 版本可用的 builders，查询时只需判断是否为 None。"""
+        gb = _get_builders
+        self._Builders = SimpleNamespace(
+            balance=getattr(gb, 'GetAllCoinBalances', None),
+            coins=getattr(gb, 'GetCoins', None),
+            object=getattr(gb, 'GetObject', None),
+            tx=getattr(gb, 'GetTx', None),
+            multi_tx=getattr(gb, 'GetMultipleTx', None),
+            multi_object=getattr(gb, 'GetMultipleObjects', None),
+            gas_price=getattr(gb, 'GetReferenceGasPrice', None),
+        )
+
+    def _start_coalescer(self, coalesce_ms: float) -> None:
+        """coalesce_ms > 0 且 pysui 提供 multiGet builders 时启动合并线程。"""
+        self._coalescer: Optional[threading.Thread] = None
+        if coalesce_ms <= 0:
+            return
+        if self._Builders.multi_object is None or self._Builders.multi_tx is None:
+            logger.warning("pysui 未提供 multiGet builders，忽略 coalesce_ms")
+            return
+        self._coalesce_window = coalesce_ms / 1000
+        self._dispatch_queue: "queue.Queue[Optional[tuple]]" = queue.Queue()
+        self._coalescer = threading.Thread(target=self._coalesce_loop, name="sui-grpc-coalescer", daemon=True)
+        self._coalescer.start()
+
+    def _dispatch(self, kind: str, item_id: str) -> Future:
+        """把单条查询放入合并队列，返回在合并请求完成后兑现的 Future。"""
+        future: Future = Future()
+        with self._dispatch_lock:
+            if self._closed:
+                raise RuntimeError("gRPC 客户端已关闭")
+            self._dispatch_queue.put((kind, item_id, future))
+        return future
+
+    def _coalesce_loop(self) -> None:
+        """取到第一条请求后等待一个窗口，把期间到达的请求按类型合并发送。"""
+        while True:
+            first = self._dispatch_queue.get()
+            if first is None:
+                return
+            time.sleep(self._coalesce_window)
+            pending = [first]
+            stop = False
+            while True:
+                try:
+                    item = self._dispatch_queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                pending.append(item)
+
+            for kind in ('object', 'tx'):
+                group = [item for item in pending if item[0] == kind]
+                for start in range(0, len(group), COALESCE_MAX_BATCH):
+                    self._flush(kind, group[start:start + COALESCE_MAX_BATCH])
+            if stop:
+                return
+
+    def _flush(self, kind: str, group: List[tuple]) -> None:
+        """
+        以一次 multiGet 请求完成一组查询，并按顺序兑现各自的 Future。
+
+        各条目的 ID 先单独转换校验，非法 ID 只让对应的 Future 失败，
+        其余条目照常合并查询。
+        """
+        valid: List[Tuple[Any, Future]] = []
+        for _, item_id, future in group:
+            if kind != 'object':
+                valid.append((item_id, future))
+                continue
+            try:
+                valid.append((_object_id_arg(item_id), future))
+            except Exception as e:
+                future.set_exception(e)
+        if not valid:
+            return
+        try:
+            ids = [item_id for item_id, _ in valid]
+            if kind == 'object':
+                builder = self._Builders.multi_object(object_ids=ids, options=_OBJECT_OPTIONS)
+            else:
+                builder = self._Builders.multi_tx(digests=ids, options=_TX_OPTIONS)
+            data = self._handle_result(self._execute(builder), f"合并查询 {len(ids)} 条")
+            if not isinstance(data, list) or len(data) != len(valid):
+                raise RuntimeError("合并查询返回的条目数与请求不一致")
+        except Exception as e:
+            for _, future in valid:
+                future.set_exception(e)
+            return
+        for (_, future), item in zip(valid, data):
+            future.set_result(item)
+
     def _handle_result(self, result: Any, operation: str) -> Dict[str, Any]:
         """兼容处理 pysui 的返回类型，统一为 dict。"""
-        # JSON-RPC 路径使用 SuiRpcResult；gRPC 可能返回不同类型
+        # JSON-RPC 路径使用 SuiRpcResult；gRPC 可能返回不同类型，按类型缓存处理函数
         try:
-            # 尝试 JSON-RPC 风格（带 is_ok/result_data）
-            if hasattr(result, 'is_ok') and callable(result.is_ok):
-                if result.is_ok():
-                    data = getattr(result, 'result_data', None)
-                    if hasattr(data, 'to_json'):
-                        return json.loads(data.to_json())
-                    return data if isinstance(data, dict) else json.loads(json.dumps(data, default=str))
-                raise RuntimeError(getattr(result, 'result_string', f"{operation} 失败"))
-
-            # gRPC：若已有 protobuf/模型对象，尝试 to_json 或转字典
-            if hasattr(result, 'to_json'):
-                return json.loads(result.to_json())
-
-            # 退化为通用序列化
-            return json.loads(json.dumps(result, default=str))
+            result_type = type(result)
+            handler = self._result_handlers.get(result_type)
+            if handler is None:
+                handler = self._result_handlers[result_type] = _resolve_result_handler(result)
+            return handler(result, operation)
         except Exception as e:
             raise RuntimeError(f"{operation} 结果处理失败: {e}") from e
 
+    def batch(self, calls: List[BatchCall]) -> List[Any]:
+        """
+        按依赖关系分层并发执行多个只读调用
+
+        没有依赖的调用位于第 0 层，依赖第 k 层结果的调用位于第 k+1 层；
+        同一层内的调用并发执行，N 个相互独立的读取只需约 1 个往返。
+
+        Returns:
+            与 calls 顺序一致的结果列表，失败（或所依赖的调用失败）的项为 {'error': ...}
+        """
+        levels: List[int] = []
+        for index, call in enumerate(calls):
+            if call.depends_on >= index:
+                raise ValueError(f"第 {index} 个调用的 depends_on={call.depends_on} 必须指向更靠前的调用")
+            levels.append(levels[call.depends_on] + 1 if call.depends_on >= 0 else 0)
+
+        results: List[Any] = [None] * len(calls)
+
+        def run(index: int) -> Any:
+            call = calls[index]
+            try:
+                if call.depends_on >= 0:
+                    upstream = results[call.depends_on]
+                    if isinstance(upstream, dict) and 'error' in upstream:
+                        return {'error': f"依赖的第 {call.depends_on} 个调用失败: {upstream['error']}"}
+                    builder = call.transform(upstream)
+                else:
+                    builder = call.builder
+                return self._handle_result(self._execute(builder), f"批量调用 #{index}")
+            except Exception as e:
+                return {'error': str(e)}
+
+        for level in range(max(levels, default=-1) + 1):
+            layer = [index for index, lv in enumerate(levels) if lv == level]
+            for index, result in zip(layer, self._batch_executor.map(run, layer)):
+                results[index] = result
+        return results
+
     def _check_connection(self):
         """以查询参考 Gas 价格/系统状态等方式做连通性验证。"""
         try:
@@ -162,9 +702,9 @@ class SuiGrpcClient:
             # 方案2：尝试通过 builder 执行简单只读请求
             if not check_ok:
                 try:
-                    import pysui.sui.sui_builders.get_builders as get_builders
-                    if hasattr(get_builders, 'GetReferenceGasPrice'):
-                        builder = get_builders.GetReferenceGasPrice()
+                    if self._Builders.gas_price is not None:
+                        builder = self._Builders.gas_price()
+                        # 直接使用主通道，不经过 _execute（后台检查时 _execute 会等待本检查完成）
                         res = self._client.execute(builder)
                         _ = self._handle_result(res, "gRPC 参考 Gas 价格查询")
                         check_ok = True
@@ -180,133 +720,153 @@ class SuiGrpcClient:
                 f"无法通过 gRPC 连接到 Sui 节点，请确认 fullnode 已开启 gRPC，或网络/证书可用。详情: {e}"
             )
 
-    def get_account_balance(self) -> Dict[str, Any]:
-        """获取账户 SUI 余额（gRPC）。"""
-        try:
-            import pysui.sui.sui_builders.get_builders as get_builders
+    def get_account_balance(self, include_objects: bool = True) -> Dict[str, Any]:
+        """
+        获取账户 SUI 余额（gRPC）。
 
+        Args:
+            include_objects: 为 False 时只计算总余额，sui_objects 返回空列表，
+                             适合只关心总额的高频轮询
+        """
+        try:
             # 优先使用 suix 等价查询（如果 pysui 将其映射到 gRPC LiveDataService）
-            builder = None
-            if hasattr(get_builders, 'GetAllCoinBalances'):
-                builder = get_builders.GetAllCoinBalances(owner=self.active_address)
-            elif hasattr(get_builders, 'GetCoins'):
-                builder = get_builders.GetCoins(owner=self.active_address, coin_type="0x2::sui::SUI")
-
-            if not builder:
+            if self._Builders.balance is not None:
+                builder = self._Builders.balance(owner=self.active_address)
+            elif self._Builders.coins is not None:
+                builder = self._Builders.coins(owner=self.active_address, coin_type=SUI_COIN_TYPE)
+            else:
                 raise RuntimeError("当前 pysui 版本不支持通过 builder 查询余额（gRPC）。")
 
-            result = self._client.execute(builder)
+            return self._shape_balance(*self._parse_balance_result(self._execute(builder), include_objects))
+        except Exception as e:
+            logger.error(f"gRPC 获取账户余额失败: {e}")
+            return self._shape_balance(0, [], error=str(e))
 
-            # 与 JSON-RPC 版本對齊：直接從 result.result_data (對象屬性) 解析，避免轉字典丟失信息
-            if hasattr(result, 'is_ok') and callable(result.is_ok) and result.is_ok():
-                balance_data = getattr(result, 'result_data', None)
-                total_balance = 0
-                sui_objects: List[Dict[str, Any]] = []
-
-                # 情況A：GetAllCoinBalances 對象，具備 items 屬性
-                if hasattr(balance_data, 'items') and balance_data.items:
-                    for balance_item in balance_data.items:
-                        if getattr(balance_item, 'coin_type', None) == '0x2::sui::SUI':
-                            total_balance = int(getattr(balance_item, 'total_balance', 0))
-                            coin_count = int(getattr(balance_item, 'coin_object_count', 0))
-                            sui_objects.append({
-                                'coin_count': coin_count,
-                                'total_balance': total_balance,
-                                'coin_type': balance_item.coin_type,
-                            })
-                            break
-
-                # 情況B：GetCoins 對象，具備 data 屬性
-                elif hasattr(balance_data, 'data') and balance_data.data:
-                    for coin in balance_data.data:
-                        bal = int(getattr(coin, 'balance', 0))
-                        total_balance += bal
-                        sui_objects.append({
-                            'object_id': getattr(coin, 'coin_object_id', ''),
-                            'balance': bal,
-                            'version': getattr(coin, 'version', ''),
-                            'digest': getattr(coin, 'digest', ''),
-                            'coin_type': getattr(coin, 'coin_type', '0x2::sui::SUI'),
-                        })
-
-                # 若上述均未獲取到，回退到字典路徑解析
-                else:
-                    data = self._handle_result(result, "账户余额查询(gRPC)")
-                    if isinstance(data, dict) and 'items' in data:
-                        for item in data.get('items', []):
-                            if item.get('coin_type') == '0x2::sui::SUI':
-                                total_balance = int(item.get('total_balance', 0))
-                                sui_objects.append({
-                                    'coin_count': int(item.get('coin_object_count', 0)),
-                                    'total_balance': total_balance,
-                                    'coin_type': item.get('coin_type'),
-                                })
-                                break
-                    elif isinstance(data, dict) and 'data' in data:
-                        for coin in data.get('data', []):
-                            bal = int(coin.get('balance', 0))
-                            total_balance += bal
-                            sui_objects.append({
-                                'object_id': coin.get('coin_object_id') or coin.get('objectId') or '',
-                                'balance': bal,
-                                'version': coin.get('version', ''),
-                                'digest': coin.get('digest', ''),
-                                'coin_type': coin.get('coin_type', '0x2::sui::SUI'),
-                            })
-
-                return {
-                    'total_balance_mists': total_balance,
-                    'total_balance_sui': total_balance / 1_000_000_000,
-                    'sui_objects': sui_objects,
-                    'active_address': str(self.active_address),
-                }
-
-            # 非標準返回，走通用處理
+    async def get_account_balance_async(self, include_objects: bool = True) -> Dict[str, Any]:
+        """
+        get_account_balance 的异步版本：底层 gRPC 客户端为同步接口，放到默认线程池中执行。
+
+        始终以 GetAllCoinBalances 的结果为准；仅当该查询失败或 pysui 未提供对应 builder 时
+        才回退到 GetCoins，保证返回结构不随调用而变化。
+        """
+        loop = asyncio.get_running_loop()
+        last_err: Optional[Exception] = None
+        if self._Builders.balance is not None:
+            builder = self._Builders.balance(owner=self.active_address)
+            try:
+                result = await loop.run_in_executor(None, self._execute, builder)
+                return self._shape_balance(*self._parse_balance_result(result, include_objects))
+            except Exception as e:
+                logger.warning(f"GetAllCoinBalances 查询失败，回退到 GetCoins: {e}")
+                last_err = e
+        if self._Builders.coins is not None:
+            builder = self._Builders.coins(owner=self.active_address, coin_type=SUI_COIN_TYPE)
+            try:
+                result = await loop.run_in_executor(None, self._execute, builder)
+                return self._shape_balance(*self._parse_balance_result(result, include_objects))
+            except Exception as e:
+                last_err = e
+        elif last_err is None:
+            last_err = RuntimeError("当前 pysui 版本不支持通过 builder 查询余额（gRPC）。")
+
+        logger.error(f"gRPC 获取账户余额失败: {last_err}")
+        return self._shape_balance(0, [], error=str(last_err))
+
+    def _parse_balance_result(self, result: Any, include_objects: bool) -> Tuple[int, List[Dict[str, Any]]]:
+        """解析余额查询的原始返回值，返回 (total, objects)。"""
+        # 与 JSON-RPC 版本对齐：成功时直接解析 result.result_data（对象属性），其余走通用处理
+        if hasattr(result, 'is_ok') and callable(result.is_ok) and result.is_ok():
+            data = getattr(result, 'result_data', None)
+        else:
             data = self._handle_result(result, "账户余额查询(gRPC)")
-            total_balance = 0
-            sui_objects: List[Dict[str, Any]] = []
-            if isinstance(data, dict) and 'items' in data:
-                for item in data.get('items', []):
-                    if item.get('coin_type') == '0x2::sui::SUI':
-                        total_balance = int(item.get('total_balance', 0))
-                        sui_objects.append({
-                            'coin_count': int(item.get('coin_object_count', 0)),
-                            'total_balance': total_balance,
-                            'coin_type': item.get('coin_type'),
-                        })
-                        break
-            elif isinstance(data, dict) and 'data' in data:
-                for coin in data.get('data', []):
-                    bal = int(coin.get('balance', 0))
+        return self._parse_balance_like(data, include_objects)
+
+    def _shape_balance(self, total_balance: int, sui_objects: List[Dict[str, Any]], **extra: Any) -> Dict[str, Any]:
+        """组装与 JSON-RPC 版本一致的余额返回结构。"""
+        return {
+            'total_balance_mists': total_balance,
+            'total_balance_sui': total_balance / 1_000_000_000,
+            'sui_objects': sui_objects,
+            'active_address': str(self.active_address),
+            **extra,
+        }
+
+    @staticmethod
+    def _parse_balance_like(obj: Any, include_objects: bool = True) -> Tuple[int, List[Dict[str, Any]]]:
+        """
+        从余额查询结果中解析 SUI 总余额与明细，返回 (total, objects)。
+
+        支持 GetAllCoinBalances（items）与 GetCoins（data）两种结果，
+        对象与字典形式共用同一套逻辑，只是取值函数不同。
+        """
+        if not isinstance(obj, dict) and not hasattr(obj, 'items') and not hasattr(obj, 'data'):
+            obj = _to_plain(obj)
+        if isinstance(obj, dict):
+            get = dict.get
+            items, coins = obj.get('items'), obj.get('data')
+        else:
+            get = getattr
+            items, coins = getattr(obj, 'items', None), getattr(obj, 'data', None)
+
+        # 情况A：GetAllCoinBalances，各币种汇总余额
+        if items:
+            for item in items:
+                if get(item, 'coin_type', None) == SUI_COIN_TYPE:
+                    total_balance = int(get(item, 'total_balance', 0))
+                    return total_balance, [{
+                        'coin_count': int(get(item, 'coin_object_count', 0)),
+                        'total_balance': total_balance,
+                        'coin_type': SUI_COIN_TYPE,
+                    }]
+            return 0, []
+
+        # 情况B：GetCoins，逐个 SUI 币对象累加；不需要明细时由 sum/map 在 C 层完成求和
+        if not include_objects:
+            return sum(map(int, (get(coin, 'balance', 0) for coin in coins or ()))), []
+
+        total_balance = 0
+        sui_objects: List[Dict[str, Any]] = []
+        if get is getattr and coins:
+            # 对象形式：attrgetter 一次取齐全部字段；字段不全（版本差异）时回退到逐个取值
+            try:
+                for object_id, balance, version, digest, coin_type in map(_coin_fields, coins):
+                    bal = int(balance)
                     total_balance += bal
                     sui_objects.append({
-                        'object_id': coin.get('coin_object_id') or coin.get('objectId') or '',
+                        'object_id': object_id or '',
                         'balance': bal,
-                        'version': coin.get('version', ''),
-                        'digest': coin.get('digest', ''),
-                        'coin_type': coin.get('coin_type', '0x2::sui::SUI'),
+                        'version': version,
+                        'digest': digest,
+                        'coin_type': coin_type,
                     })
-
-            return {
-                'total_balance_mists': total_balance,
-                'total_balance_sui': total_balance / 1_000_000_000,
-                'sui_objects': sui_objects,
-                'active_address': str(self.active_address),
-            }
-        except Exception as e:
-            logger.error(f"gRPC 获取账户余额失败: {e}")
-            return {
-                'total_balance_mists': 0,
-                'total_balance_sui': 0.0,
-                'sui_objects': [],
-                'active_address': str(self.active_address),
-                'error': str(e)
-            }
+                return total_balance, sui_objects
+            except AttributeError:
+                total_balance = 0
+                sui_objects = []
+
+        for coin in coins or ():
+            bal = int(get(coin, 'balance', 0))
+            total_balance += bal
+            sui_objects.append({
+                'object_id': get(coin, 'coin_object_id', None) or get(coin, 'objectId', None) or '',
+                'balance': bal,
+                'version': get(coin, 'version', ''),
+                'digest': get(coin, 'digest', ''),
+                'coin_type': get(coin, 'coin_type', SUI_COIN_TYPE),
+            })
+        return total_balance, sui_objects
 
     def deploy_contract(self, package_path: str, gas_budget: Optional[int] = None,
-                        build_args: Optional[List[str]] = None) -> Dict[str, Any]:
-        """通过 gRPC 部署 Move 包。"""
+                        build_args: Optional[List[str]] = None,
+                        inspect_cost: bool = False) -> Dict[str, Any]:
+        """
+        通过 gRPC 部署 Move 包。
+
+        inspect_cost 为 True 时先做一次 dry-run 估算成本（结果保存在 last_cost），
+        仅用于观察 gas 消耗；默认跳过以省去一次往返，gas 预算由 SuiTransaction 自动处理。
+        """
         try:
+            self._await_health()
             from pathlib import Path
             pkg = Path(package_path)
             if not pkg.exists():
@@ -315,28 +875,29 @@ class SuiGrpcClient:
                 raise FileNotFoundError(f"在 {package_path} 中未找到 Move.toml")
 
             # 使用 SuiTransaction（pysui 统一抽象，gRPC 后端执行）
-            from pysui.sui.sui_txn.sync_transaction import SuiTransaction
             txn = SuiTransaction(client=self._client, initial_sender=self.active_address)
 
             upgrade_cap = txn.publish(project_path=str(pkg), args_list=build_args or [])
             txn.transfer_objects(transfers=[upgrade_cap], recipient=self.active_address)
 
-            # 可选：检查成本
-            try:
-                _ = txn.inspect_for_cost()
-            except Exception:
-                pass
+            if inspect_cost:
+                self._inspect_cost(txn)
 
             res = txn.execute()
             deploy_data = self._handle_result(res, "合约部署(gRPC)")
 
             package_id = None
             upgrade_cap_id = None
-            for ch in deploy_data.get('objectChanges', []) if isinstance(deploy_data, dict) else []:
-                if ch.get('type') == 'published':
+            # 单次遍历，两个 ID 都找到后立即停止
+            for ch in deploy_data.get('objectChanges') or () if isinstance(deploy_data, dict) else ():
+                ch_type = ch.get('type')
+                if ch_type == 'published' and package_id is None:
                     package_id = ch.get('packageId')
-                elif ch.get('type') == 'created' and '::package::UpgradeCap' in ch.get('objectType', ''):
+                elif (ch_type == 'created' and upgrade_cap_id is None
+                      and ch.get('objectType', '').endswith('::package::UpgradeCap')):
                     upgrade_cap_id = ch.get('objectId')
+                if package_id and upgrade_cap_id:
+                    break
 
             return {
                 'package_id': package_id,
@@ -350,45 +911,32 @@ class SuiGrpcClient:
             logger.error(f"gRPC 合约部署失败: {e}")
             raise
 
+    def _inspect_cost(self, txn: Any) -> None:
+        """dry-run 估算事务成本并记录到 last_cost；失败时不影响事务提交。"""
+        try:
+            self.last_cost = txn.inspect_for_cost()
+            logger.info("gRPC 成本估算: %s", self.last_cost)
+        except Exception as e:
+            logger.warning("gRPC 成本估算失败: %s", e)
+
     def call_contract_function(self, package_id: str, module_name: str, function_name: str,
                                arguments: Optional[List[Any]] = None,
                                type_arguments: Optional[List[str]] = None,
-                               gas_budget: Optional[int] = None) -> Dict[str, Any]:
-        """通过 gRPC 调用合约函数。"""
+                               gas_budget: Optional[int] = None,
+                               inspect_cost: bool = False) -> Dict[str, Any]:
+        """通过 gRPC 调用合约函数。inspect_cost 含义同 deploy_contract。"""
         try:
-            from pysui.sui.sui_txn.sync_transaction import SuiTransaction
-            from pysui import ObjectID
-            from pysui.sui.sui_types.scalars import SuiU64, SuiString
-
+            self._await_health()
             txn = SuiTransaction(client=self._client, initial_sender=self.active_address)
             target = f"{package_id}::{module_name}::{function_name}"
 
-            processed_args: List[Any] = []
-            if arguments:
-                for arg in arguments:
-                    if isinstance(arg, str) and arg.startswith('0x') and len(arg) >= 3:
-                        # 尝试作为 ObjectID
-                        try:
-                            processed_args.append(ObjectID(arg))
-                            continue
-                        except Exception:
-                            pass
-                        processed_args.append(SuiString(arg))
-                    elif isinstance(arg, bytes):
-                        processed_args.append(list(arg))
-                    elif isinstance(arg, int):
-                        processed_args.append(SuiU64(arg))
-                    elif isinstance(arg, bool):
-                        processed_args.append(arg)
-                    else:
-                        processed_args.append(arg)
+            convert = _ARG_DISPATCH.get
+            processed_args = [convert(type(arg), _passthrough_arg)(arg) for arg in arguments or ()]
 
             _ = txn.move_call(target=target, arguments=processed_args, type_arguments=type_arguments or [])
 
-            try:
-                _ = txn.inspect_for_cost()
-            except Exception:
-                pass
+            if inspect_cost:
+                self._inspect_cost(txn)
 
             res = txn.execute()
             call_data = self._handle_result(res, "合约函数调用(gRPC)")
@@ -405,18 +953,54 @@ class SuiGrpcClient:
             logger.error(f"gRPC 合约函数调用失败: {e}")
             raise
 
-    def get_object_info(self, object_id: str) -> Dict[str, Any]:
-        """通过 gRPC 查询对象信息。"""
+    def wait_for_tx(self, digest: str, timeout: float = 30.0, poll_interval: float = 0.2) -> Dict[str, Any]:
+        """
+        等待交易可查询（已在节点上完成执行）后立即返回
+
+        以短间隔轮询交易查询，间隔按 1.5 倍递增（上限 2 秒），交易一出现即返回，
+        替代固定时长的 sleep。
+
+        Args:
+            digest: 交易哈希
+            timeout: 最长等待秒数
+            poll_interval: 首次轮询间隔（秒）
+
+        Returns:
+            交易信息字典
+
+        Raises:
+            TimeoutError: 超时仍未查询到交易
+        """
+        if self._Builders.tx is None:
+            raise RuntimeError("pysui 不支持 GetTx builder (gRPC)")
+
+        deadline = time.monotonic() + timeout
+        interval = poll_interval
+        last_error: Optional[Exception] = None
+        while True:
+            try:
+                builder = self._Builders.tx(digest=digest, options={"showEffects": True})
+                return self._handle_result(self._execute(builder), f"等待交易 {digest}")
+            except Exception as e:
+                last_error = e
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError(f"等待交易 {digest} 超时（{timeout}s）: {last_error}")
+            time.sleep(min(interval, remaining))
+            interval = min(interval * 1.5, 2.0)
+
+    def get_object_info(self, object_id: Any) -> Dict[str, Any]:
+        """通过 gRPC 查询对象信息。object_id 可为 0x 字符串或 ObjectID。"""
         try:
-            import pysui.sui.sui_builders.get_builders as get_builders
-            from pysui import ObjectID
+            if self._coalescer is not None:
+                return self._dispatch('object', object_id).result(timeout=COALESCE_RESULT_TIMEOUT)
 
-            if hasattr(get_builders, 'GetObject'):
-                builder = get_builders.GetObject(
-                    object_id=ObjectID(object_id),
-                    options={"showType": True, "showContent": True, "showOwner": True},
+            if self._Builders.object is not None:
+                builder = self._Builders.object(
+                    object_id=_object_id_arg(object_id),
+                    options=_OBJECT_OPTIONS,
                 )
-                res = self._client.execute(builder)
+                res = self._execute(builder)
                 return self._handle_result(res, f"获取对象信息(gRPC) {object_id}")
 
             raise RuntimeError("pysui 不支持 GetObject builder (gRPC)")
@@ -424,35 +1008,34 @@ class SuiGrpcClient:
             logger.error(f"gRPC 获取对象信息失败: {e}")
             return {'object_id': object_id, 'error': str(e)}
 
-    def get_transaction_info(self, tx_hash: str) -> Dict[str, Any]:
-        """通过 gRPC 查询交易信息。"""
+    def get_transaction_info(self, tx_hash: str, *, fields: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """
+        通过 gRPC 查询交易信息。
+
+        Args:
+            tx_hash: 交易哈希
+            fields: 需要的字段（input / effects / status / gas_used / events / object_changes），
+                    只请求并解码这些部分；默认 None 表示全部字段
+        """
         try:
-            import pysui.sui.sui_builders.get_builders as get_builders
+            options = _tx_options(fields)
+            if self._coalescer is not None and fields is None:
+                return self._dispatch('tx', tx_hash).result(timeout=COALESCE_RESULT_TIMEOUT)
 
-            if hasattr(get_builders, 'GetTx'):
-                builder = get_builders.GetTx(
+            if self._Builders.tx is not None:
+                builder = self._Builders.tx(
                     digest=tx_hash,
-                    options={
-                        "showInput": True,
-                        "showEffects": True,
-                        "showEvents": True,
-                        "showObjectChanges": True,
-                    },
+                    options=options,
                 )
-                res = self._client.execute(builder)
+                res = self._execute(builder)
                 return self._handle_result(res, f"获取交易信息(gRPC) {tx_hash}")
 
-            if hasattr(get_builders, 'GetMultipleTx'):
-                builder = get_builders.GetMultipleTx(
+            if self._Builders.multi_tx is not None:
+                builder = self._Builders.multi_tx(
                     digests=[tx_hash],
-                    options={
-                        "showInput": True,
-                        "showEffects": True,
-                        "showEvents": True,
-                        "showObjectChanges": True,
-                    },
+                    options=options,
                 )
-                res = self._client.execute(builder)
+                res = self._execute(builder)
                 data = self._handle_result(res, f"获取交易信息(gRPC) {tx_hash}")
                 if isinstance(data, list) and data:
                     return data[0]
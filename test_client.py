@@ -9,14 +9,21 @@ import traceback
 from sui_client import SuiContractClient
 
 
-def test_basic_functionality():
-    """测试基本功能"""
+def test_basic_functionality(client=None):
+    """
+    测试基本功能
+    
+    Args:
+        client: 已有的SuiContractClient实例；为None时新建，并在测试结束时关闭
+    """
     print("🧪 开始测试Sui客户端基本功能...\n")
     
+    owned = client is None
     try:
         # 1. 测试客户端初始化
         print("1. 测试客户端初始化...")
-        client = SuiContractClient()
+        if owned:
+            client = SuiContractClient()
         print("✅ 客户端初始化成功")
         print(f"   - RPC URL: {client.config.rpc_url}")
         print(f"   - 活跃地址: {client.active_address}")
@@ -82,16 +89,19 @@ def test_basic_functionality():
         print(f"❌ 测试失败: {e}")
         print(f"错误详情:\n{traceback.format_exc()}")
         return False
+    finally:
+        if owned and client is not None:
+            client.close()
 
 
-def main():
-    """主函数"""
+def main(client=None):
+    """主函数；client为已有的SuiContractClient实例时复用它"""
     print("=" * 50)
     print("    Sui区块链客户端基础功能测试")
     print("=" * 50)
     print()
     
-    success = test_basic_functionality()
+    success = test_basic_functionality(client)
     
     print("\n" + "=" * 50)
     if success:
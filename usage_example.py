@@ -14,14 +14,21 @@ except Exception:
     SuiGrpcClient = None
 
 
-def main():
-    """完整的使用示例"""
+def main(client=None):
+    """
+    完整的使用示例
+    
+    Args:
+        client: 已有的SuiContractClient实例；为None时新建，并在示例结束时关闭
+    """
+    owned = client is None
     try:
         print("=== Sui智能合约客户端使用示例 ===\n")
         
         # 1. 初始化客户端 (JSON-RPC)
         print("1. 初始化 JSON-RPC 客户端...")
-        client = SuiContractClient()
+        if owned:
+            client = SuiContractClient()
         print("✓ JSON-RPC 客户端初始化成功\n")
         
         # 2. 查询账户余额
@@ -40,8 +47,9 @@ def main():
         if SuiGrpcClient is not None:
             try:
                 print("3. 初始化 gRPC 客户端并查询余额...")
-                gclient = SuiGrpcClient()
-                gbalance = gclient.get_account_balance()
+                # 查询完成即关闭 gRPC 通道
+                with SuiGrpcClient() as gclient:
+                    gbalance = gclient.get_account_balance()
                 print(f"   (gRPC) 活跃地址: {gbalance['active_address']}")
                 print(f"   (gRPC) 总余额: {gbalance['total_balance_sui']:.6f} SUI")
                 print(f"   (gRPC) SUI对象数量: {len(gbalance['sui_objects'])}")
@@ -59,6 +67,9 @@ def main():
         
     except Exception as e:
         print(f"❌ 示例执行过程中发生错误: {e}")
+    finally:
+        if owned and client is not None:
+            client.close()
 
 
 if __name__ == "__main__":
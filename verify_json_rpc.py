@@ -4,34 +4,92 @@
 通过多种方法确认我们使用的是JSON-RPC而不是GraphQL
 """
 
-import inspect
 import json
+import re
+from functools import lru_cache
 from sui_client import SuiContractClient
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# 输出用的分隔线
+_SEP40 = "-" * 40
+_SEP60 = "=" * 60
+
+
+@lru_cache(maxsize=1)
+def _get_client() -> SuiContractClient:
+    """整个验证过程共用一个客户端，配置加载与连接建立只发生一次"""
+    return SuiContractClient()
+
+
+def _format_json(data):
+    """格式化输出builder参数等结构；可用时使用orjson，否则回退到标准库json"""
+    if orjson is not None:
+        return orjson.dumps(data, default=str,
+                            option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode('utf-8')
+    return json.dumps(data, indent=2, ensure_ascii=False, default=str)
+
+
+def _type_name(obj):
+    """对象类型的完整名称: 模块.类名"""
+    obj_type = type(obj)
+    return f"{obj_type.__module__}.{obj_type.__qualname__}"
+
+
+# 典型的JSON-RPC方法与builder（按显示顺序）
+_JSON_RPC_METHODS = (
+    "sui_getObject",
+    "sui_getOwnedObjects",
+    "sui_executeTransactionBlock",
+    "sui_dryRunTransactionBlock",
+    "sui_getTransactionBlock",
+    "sui_getBalance",
+    "sui_getAllBalances",
+)
+_BUILDERS = ("GetObject", "GetOwnedObjects", "GetTransactionBlock", "GetBalance", "GetAllBalances")
+
+# GraphQL相关方法名的特征
+_GRAPHQL_RE = re.compile("query|mutation|subscription|graphql")
+
+# id(client) -> (rpc_api, 小写方法名集合)，每个客户端只构建一次
+_rpc_api_cache = {}
+
+
+def _rpc_api_keys(client):
+    """返回客户端的rpc_api及其小写方法名集合"""
+    cached = _rpc_api_cache.get(id(client))
+    if cached is None:
+        rpc_api = client.client.rpc_api
+        cached = _rpc_api_cache[id(client)] = (rpc_api, {name.lower() for name in rpc_api})
+    return cached
+
 
 def verify_imports():
     """验证导入的模块类型"""
     print("🔍 1. 验证导入的模块类型:")
-    print("-" * 40)
+    print(_SEP40)
     
-    # 创建客户端实例
-    client = SuiContractClient()
+    # 获取（共享的）客户端实例
+    client = _get_client()
     
     # 检查客户端类型
-    client_class = client.client.__class__
-    print(f"✅ 客户端类型: {client_class.__module__}.{client_class.__name__}")
+    client_module = type(client.client).__module__
+    print(f"✅ 客户端类型: {_type_name(client.client)}")
     
     # 检查是否是JSON-RPC客户端
-    if "sync_client" in client_class.__module__:
+    if "sync_client" in client_module:
         print("✅ 确认使用的是同步JSON-RPC客户端")
-    elif "async_client" in client_class.__module__:
+    elif "async_client" in client_module:
         print("✅ 确认使用的是异步JSON-RPC客户端")
     else:
         print("❌ 未知的客户端类型")
     
     # 检查配置类型
-    config_class = client.config.__class__
-    print(f"✅ 配置类型: {config_class.__module__}.{config_class.__name__}")
+    print(f"✅ 配置类型: {_type_name(client.config)}")
     
     # 检查RPC URL
     print(f"✅ RPC URL: {client.config.rpc_url}")
@@ -42,33 +100,22 @@ def verify_imports():
 def verify_rpc_methods(client):
     """验证RPC方法"""
     print("\n🔍 2. 验证可用的RPC方法:")
-    print("-" * 40)
+    print(_SEP40)
     
     # 获取RPC API方法
-    rpc_api = client.client.rpc_api
+    rpc_api, lower_keys = _rpc_api_keys(client)
     print(f"✅ 可用RPC方法总数: {len(rpc_api)}")
     
     # 显示一些典型的JSON-RPC方法
-    json_rpc_methods = [
-        "sui_getObject",
-        "sui_getOwnedObjects", 
-        "sui_executeTransactionBlock",
-        "sui_dryRunTransactionBlock",
-        "sui_getTransactionBlock",
-        "sui_getBalance",
-        "sui_getAllBalances"
-    ]
-    
     print("✅ 典型的JSON-RPC方法:")
-    for method in json_rpc_methods:
+    for method in _JSON_RPC_METHODS:
         if method in rpc_api:
             print(f"   ✓ {method}")
         else:
             print(f"   ✗ {method} (未找到)")
     
     # 检查是否有GraphQL相关的方法
-    graphql_indicators = ["query", "mutation", "subscription", "graphql"]
-    has_graphql = any(indicator in str(rpc_api.keys()).lower() for indicator in graphql_indicators)
+    has_graphql = any(_GRAPHQL_RE.search(name) for name in lower_keys)
     
     if not has_graphql:
         print("✅ 确认: 没有发现GraphQL相关的方法")
@@ -79,20 +126,20 @@ def verify_rpc_methods(client):
 def verify_transaction_type(client):
     """验证事务类型"""
     print("\n🔍 3. 验证事务类型:")
-    print("-" * 40)
+    print(_SEP40)
     
     # 创建事务对象
     txn = client.client.transaction()
-    txn_class = txn.__class__
+    txn_module = type(txn).__module__
     
-    print(f"✅ 事务类型: {txn_class.__module__}.{txn_class.__name__}")
+    print(f"✅ 事务类型: {_type_name(txn)}")
     
     # 检查是否是JSON-RPC事务
-    if "sui_txn" in txn_class.__module__:
+    if "sui_txn" in txn_module:
         print("✅ 确认使用的是JSON-RPC事务类")
-    elif "sui_pgql" in txn_class.__module__:
+    elif "sui_pgql" in txn_module:
         print("❌ 警告: 使用的是GraphQL事务类")
-    elif "sui_grpc" in txn_class.__module__:
+    elif "sui_grpc" in txn_module:
         print("❌ 警告: 使用的是gRPC事务类")
     else:
         print("❓ 未知的事务类型")
@@ -101,7 +148,7 @@ def verify_transaction_type(client):
 def verify_builders():
     """验证使用的builders类型"""
     print("\n🔍 4. 验证Builders类型:")
-    print("-" * 40)
+    print(_SEP40)
     
     try:
         # 导入JSON-RPC builders
@@ -109,31 +156,21 @@ def verify_builders():
         print("✅ 成功导入JSON-RPC builders")
         
         # 检查一些典型的builder
-        builders = [
-            "GetObject",
-            "GetOwnedObjects", 
-            "GetTransactionBlock",
-            "GetBalance",
-            "GetAllBalances"
-        ]
-        
-        for builder_name in builders:
-            if hasattr(get_builders, builder_name):
-                builder_class = getattr(get_builders, builder_name)
-                print(f"   ✓ {builder_name}: {builder_class.__module__}")
-            else:
+        for builder_name in _BUILDERS:
+            builder_class = getattr(get_builders, builder_name, None)
+            if builder_class is None:
                 print(f"   ✗ {builder_name}: 未找到")
+            else:
+                print(f"   ✓ {builder_name}: {builder_class.__module__}")
                 
     except ImportError as e:
         print(f"❌ 导入JSON-RPC builders失败: {e}")
 
 
-def verify_network_requests():
+def verify_network_requests(client):
     """验证网络请求类型"""
     print("\n🔍 5. 验证网络请求类型:")
-    print("-" * 40)
-    
-    client = SuiContractClient()
+    print(_SEP40)
     
     # 检查HTTP客户端类型
     http_client = client.client._client
@@ -146,16 +183,31 @@ def verify_network_requests():
     # 检查是否是同步客户端
     is_sync = client.client.is_synchronous
     print(f"✅ 同步客户端: {is_sync}")
+    
+    # 多个探测调用合并为一次JSON-RPC批量请求（id数组），只需一次网络往返
+    probes = [
+        ("sui_getChainIdentifier", []),
+        ("sui_getLatestCheckpointSequenceNumber", []),
+        ("suix_getReferenceGasPrice", []),
+    ]
+    try:
+        results = client.batch_call(probes)
+        for (method, _), result in zip(probes, results):
+            if isinstance(result, dict) and 'error' in result:
+                print(f"   ✗ {method}: {result['error']}")
+            else:
+                print(f"   ✓ {method}: {result}")
+        print("✅ 确认: 节点接受JSON-RPC批量请求")
+    except Exception as e:
+        print(f"❌ 批量JSON-RPC请求失败: {e}")
 
 
 def verify_request_format():
     """验证请求格式"""
     print("\n🔍 6. 验证JSON-RPC请求格式:")
-    print("-" * 40)
+    print(_SEP40)
     
     try:
-        client = SuiContractClient()
-        
         # 使用低级别方法创建一个简单的查询
         import pysui.sui.sui_builders.get_builders as get_builders
         
@@ -166,11 +218,11 @@ def verify_request_format():
         
         # 检查builder的属性
         print(f"✅ Builder方法: {builder.method}")
-        print(f"✅ Builder参数: {builder.params}")
-        print(f"✅ Builder头部: {builder.header}")
+        print(f"✅ Builder参数: {_format_json(builder.params)}")
+        print(f"✅ Builder头部: {_format_json(builder.header)}")
         
         # 验证这是JSON-RPC格式
-        if hasattr(builder, 'method') and builder.method.startswith('sui_'):
+        if getattr(builder, 'method', '').startswith('sui_'):
             print("✅ 确认: 使用的是标准JSON-RPC方法命名格式")
         else:
             print("❌ 警告: 不是标准JSON-RPC格式")
@@ -188,9 +240,9 @@ def verify_request_format():
 
 def main():
     """主验证函数"""
-    print("=" * 60)
+    print(_SEP60)
     print("    🌊 Sui客户端JSON-RPC验证工具 🌊")
-    print("=" * 60)
+    print(_SEP60)
     
     try:
         # 1. 验证导入的模块
@@ -206,19 +258,19 @@ def main():
         verify_builders()
         
         # 5. 验证网络请求
-        verify_network_requests()
+        verify_network_requests(client)
         
         # 6. 验证请求格式
         verify_request_format()
         
-        print("\n" + "=" * 60)
+        print("\n" + _SEP60)
         print("🎉 验证完成!")
         print("\n📋 总结:")
         print("✅ 客户端使用的是JSON-RPC接口")
         print("✅ 没有使用GraphQL或gRPC")
         print("✅ 所有网络请求都通过JSON-RPC协议")
         print("✅ 事务构建使用JSON-RPC builders")
-        print("=" * 60)
+        print(_SEP60)
         
     except Exception as e:
         print(f"\n❌ 验证过程中出现错误: {e}")
@@ -4,68 +4,151 @@
 通过检查代码结构和导入来确认使用的是JSON-RPC而不是GraphQL
 """
 
+import argparse
+import ast
 import warnings
-import inspect
 import sys
 import os
+from collections import Counter
+from functools import lru_cache
+from pathlib import Path
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
 
 # 抑制deprecation警告（验证过程中预期会有）
 warnings.filterwarnings("ignore", category=DeprecationWarning)
 
 
+# 输出用的分隔线
+_SEP40 = "-" * 40
+_SEP60 = "=" * 60
+
+
+@lru_cache(maxsize=1)
+def _load_sui_client_source():
+    """读取sui_client.py源码（bytes），只读一次供各检查共用；所有模式均为ASCII，无需解码"""
+    return Path('sui_client.py').read_bytes()
+
+
+def _pattern_counter(patterns):
+    """
+    构建统计多个字面量模式出现次数的函数: content(bytes) -> Counter
+    
+    优先使用pyahocorasick（Aho-Corasick自动机，一次扫描）；未安装时对每个模式
+    调用bytes.count，由C层的内存查找完成，比Python层的正则逐位置匹配更快。
+    返回的Counter只包含出现过的模式。
+    """
+    patterns = list(dict.fromkeys(patterns))
+    if ahocorasick is not None:
+        automaton = ahocorasick.Automaton()
+        for pattern in patterns:
+            automaton.add_word(pattern, pattern)
+        automaton.make_automaton()
+        # pyahocorasick默认构建只接受str
+        return lambda content: Counter(pattern for _, pattern in automaton.iter(content.decode('utf-8')))
+    
+    encoded = [(pattern, pattern.encode()) for pattern in patterns]
+    
+    def count(content):
+        counts = Counter()
+        for pattern, pattern_bytes in encoded:
+            n = content.count(pattern_bytes)
+            if n:
+                counts[pattern] = n
+        return counts
+    
+    return count
+
+
+# 关键导入（按显示顺序）及其模块名
+_JSON_RPC_IMPORTS = (
+    ("from pysui.sui.sui_clients.sync_client import SuiClient as SyncClient", "pysui.sui.sui_clients.sync_client"),
+    ("from pysui.sui.sui_txn.sync_transaction import SuiTransaction", "pysui.sui.sui_txn.sync_transaction"),
+    ("import pysui.sui.sui_builders.get_builders as get_builders", "pysui.sui.sui_builders.get_builders"),
+)
+_GRAPHQL_KEYWORDS = ("SyncGqlClient", "AsyncGqlClient", "pgql_sync_txn", "pgql_async_txn", "pgql_query")
+_GRPC_KEYWORDS = ("SuiGrpcClient", "pgrpc_async_txn", "sui_grpc")
+
+# JSON-RPC与GraphQL特有的代码模式
+_JSON_RPC_PATTERNS = (
+    "SyncClient",
+    "sui_builders.get_builders",
+    "client.execute(builder",
+    "SuiTransaction",
+    "_move_call",
+    "txn.publish",
+)
+_GRAPHQL_PATTERNS = ("SyncGqlClient", "execute_query_node", "with_node=", "pgql_query", "qn.")
+
+# 典型的JSON-RPC builder类
+_BUILDERS = ("GetObject", "GetOwnedObjects", "GetTransactionBlock", "GetBalance", "GetAllBalances")
+
+# 集合形式，用于统计命中数
+_GRAPHQL_KEYWORD_SET = frozenset(_GRAPHQL_KEYWORDS)
+_GRPC_KEYWORD_SET = frozenset(_GRPC_KEYWORDS)
+_GRAPHQL_PATTERN_SET = frozenset(_GRAPHQL_PATTERNS)
+
+# 扫描器在导入时构建一次
+_count_code_patterns = _pattern_counter(_JSON_RPC_PATTERNS + _GRAPHQL_PATTERNS)
+
+
+def _imported_names(source):
+    """
+    解析源码中的import语句，返回 (模块名集合, 标识符集合)
+    
+    标识符集合包含模块名的每一段与导入的名称，用于按关键字精确匹配；
+    注释与字符串中出现的文字不会被误判为导入。
+    """
+    modules = set()
+    names = set()
+    for node in ast.walk(ast.parse(source)):
+        if isinstance(node, ast.ImportFrom) and node.module:
+            modules.add(node.module)
+            names.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.Import):
+            modules.update(alias.name for alias in node.names)
+    for module in modules:
+        names.update(module.split('.'))
+    return modules, names
+
+
 def verify_imports_static():
     """静态验证导入的模块类型"""
     print("🔍 1. 静态验证导入的模块类型:")
-    print("-" * 40)
+    print(_SEP40)
     
     # 检查我们的客户端代码导入
     print("✅ 检查sui_client.py中的导入:")
     
     # 读取sui_client.py文件
-    with open('sui_client.py', 'r', encoding='utf-8') as f:
-        content = f.read()
-    
-    # 检查关键导入
-    json_rpc_imports = [
-        "from pysui.sui.sui_clients.sync_client import SuiClient as SyncClient",
-        "from pysui.sui.sui_txn.sync_transaction import SuiTransaction",
-        "import pysui.sui.sui_builders.get_builders as get_builders",
-    ]
-    
-    graphql_imports = [
-        "SyncGqlClient",
-        "AsyncGqlClient", 
-        "pgql_sync_txn",
-        "pgql_async_txn",
-        "pgql_query"
-    ]
+    content = _load_sui_client_source()
     
-    grpc_imports = [
-        "SuiGrpcClient",
-        "pgrpc_async_txn",
-        "sui_grpc"
-    ]
+    # 一次解析得到全部导入，之后都是集合查找
+    modules, names = _imported_names(content)
     
     # 检查JSON-RPC导入
     json_rpc_found = 0
-    for import_line in json_rpc_imports:
-        if import_line.replace("from ", "").replace("import ", "") in content:
+    for import_line, module in _JSON_RPC_IMPORTS:
+        if module in modules:
             print(f"   ✓ 找到JSON-RPC导入: {import_line}")
             json_rpc_found += 1
     
     # 检查GraphQL导入
-    graphql_found = 0
-    for import_keyword in graphql_imports:
-        if import_keyword in content:
+    graphql_hits = _GRAPHQL_KEYWORD_SET & names
+    for import_keyword in _GRAPHQL_KEYWORDS:
+        if import_keyword in graphql_hits:
             print(f"   ❌ 找到GraphQL导入: {import_keyword}")
-            graphql_found += 1
+    graphql_found = len(graphql_hits)
     
     # 检查gRPC导入
-    grpc_found = 0
-    for import_keyword in grpc_imports:
-        if import_keyword in content:
+    grpc_hits = _GRPC_KEYWORD_SET & names
+    for import_keyword in _GRPC_KEYWORDS:
+        if import_keyword in grpc_hits:
             print(f"   ❌ 找到gRPC导入: {import_keyword}")
-            grpc_found += 1
+    grpc_found = len(grpc_hits)
     
     print(f"\n   📊 统计:")
     print(f"   - JSON-RPC相关导入: {json_rpc_found}")
@@ -81,7 +164,7 @@ def verify_imports_static():
 def verify_module_paths():
     """验证模块路径"""
     print("\n🔍 2. 验证pysui模块路径:")
-    print("-" * 40)
+    print(_SEP40)
     
     try:
         # 导入pysui核心模块
@@ -121,7 +204,7 @@ def verify_module_paths():
 def verify_class_inheritance():
     """验证类继承关系"""
     print("\n🔍 3. 验证类继承关系:")
-    print("-" * 40)
+    print(_SEP40)
     
     try:
         # 导入JSON-RPC客户端类
@@ -150,30 +233,21 @@ def verify_class_inheritance():
 def verify_builders_structure():
     """验证builders结构"""
     print("\n🔍 4. 验证JSON-RPC Builders结构:")
-    print("-" * 40)
+    print(_SEP40)
     
     try:
         # 导入JSON-RPC builders
         from pysui.sui.sui_builders import get_builders
         
-        # 检查典型的JSON-RPC builder类
-        builders = [
-            "GetObject",
-            "GetOwnedObjects", 
-            "GetTransactionBlock",
-            "GetBalance",
-            "GetAllBalances"
-        ]
-        
         print("✅ 可用的JSON-RPC Builders:")
-        for builder_name in builders:
-            if hasattr(get_builders, builder_name):
-                builder_class = getattr(get_builders, builder_name)
+        for builder_name in _BUILDERS:
+            builder_class = getattr(get_builders, builder_name, None)
+            if builder_class is None:
+                print(f"   ✗ {builder_name}: 未找到")
+            else:
                 print(f"   ✓ {builder_name}")
                 print(f"     - 模块: {builder_class.__module__}")
                 print(f"     - 基类: {[base.__name__ for base in builder_class.__bases__]}")
-            else:
-                print(f"   ✗ {builder_name}: 未找到")
         
         # 检查builders模块路径
         if "sui_builders" in get_builders.__file__:
@@ -186,7 +260,7 @@ def verify_builders_structure():
 def verify_method_signatures():
     """验证方法签名"""
     print("\n🔍 5. 验证JSON-RPC方法签名:")
-    print("-" * 40)
+    print(_SEP40)
     
     try:
         from pysui.sui.sui_builders.get_builders import GetObject
@@ -195,24 +269,28 @@ def verify_method_signatures():
         builder = GetObject(object_id="0x1")
         
         # 检查关键属性
-        if hasattr(builder, 'method'):
-            print(f"✅ Builder方法属性: {builder.method}")
+        method = getattr(builder, 'method', None)
+        if method is not None:
+            print(f"✅ Builder方法属性: {method}")
             
             # 检查是否是JSON-RPC方法格式
-            if builder.method.startswith('sui_'):
+            if method.startswith('sui_'):
                 print("   ✅ 确认: 使用标准JSON-RPC方法命名格式")
             else:
                 print("   ❌ 警告: 不是标准JSON-RPC格式")
         
-        if hasattr(builder, 'params'):
-            print(f"✅ Builder参数: {type(builder.params)}")
+        params = getattr(builder, 'params', None)
+        if params is not None:
+            print(f"✅ Builder参数: {type(params)}")
         
-        if hasattr(builder, 'header'):
-            print(f"✅ Builder头部: {builder.header}")
+        header = getattr(builder, 'header', None)
+        if header is not None:
+            print(f"✅ Builder头部: {header}")
             
         # 检查数据字典结构
-        if hasattr(builder, 'data_dict'):
-            print(f"✅ Builder数据字典: {list(builder.data_dict.keys())}")
+        data_dict = getattr(builder, 'data_dict', None)
+        if data_dict is not None:
+            print(f"✅ Builder数据字典: {list(data_dict.keys())}")
             
     except Exception as e:
         print(f"❌ 验证方法签名时出错: {e}")
@@ -221,75 +299,66 @@ def verify_method_signatures():
 def check_code_patterns():
     """检查代码模式"""
     print("\n🔍 6. 检查代码中的JSON-RPC模式:")
-    print("-" * 40)
+    print(_SEP40)
     
     # 读取sui_client.py文件
-    with open('sui_client.py', 'r', encoding='utf-8') as f:
-        content = f.read()
-    
-    # JSON-RPC特有的模式
-    json_rpc_patterns = [
-        "SyncClient",
-        "sui_builders.get_builders",
-        "client.execute(builder",
-        "SuiTransaction",
-        "_move_call",
-        "txn.publish"
-    ]
+    content = _load_sui_client_source()
     
-    # GraphQL特有的模式
-    graphql_patterns = [
-        "SyncGqlClient",
-        "execute_query_node",
-        "with_node=",
-        "pgql_query",
-        "qn."
-    ]
+    counts = _count_code_patterns(content)
     
     print("✅ JSON-RPC代码模式:")
-    for pattern in json_rpc_patterns:
-        count = content.count(pattern)
+    for pattern in _JSON_RPC_PATTERNS:
+        count = counts[pattern]
         if count > 0:
             print(f"   ✓ '{pattern}': 出现 {count} 次")
     
     print("\n✅ GraphQL代码模式:")
-    graphql_found = False
-    for pattern in graphql_patterns:
-        count = content.count(pattern)
+    for pattern in _GRAPHQL_PATTERNS:
+        count = counts[pattern]
         if count > 0:
             print(f"   ❌ '{pattern}': 出现 {count} 次")
-            graphql_found = True
     
-    if not graphql_found:
+    if not _GRAPHQL_PATTERN_SET & counts.keys():
         print("   ✅ 未发现GraphQL代码模式")
 
 
-def main():
+def _build_parser():
+    parser = argparse.ArgumentParser(description='Sui客户端JSON-RPC离线验证工具')
+    parser.add_argument('--static-only', action='store_true',
+                        help='只做源码静态检查（第1、6项），不导入pysui，适合CI快速检查')
+    return parser
+
+
+def main(argv=None):
     """主验证函数"""
-    print("=" * 60)
+    args = _build_parser().parse_args(argv)
+    
+    print(_SEP60)
     print("    🌊 Sui客户端JSON-RPC离线验证工具 🌊")
-    print("=" * 60)
+    print(_SEP60)
     
     try:
         # 1. 静态验证导入
         verify_imports_static()
         
-        # 2. 验证模块路径
-        verify_module_paths()
-        
-        # 3. 验证类继承
-        verify_class_inheritance()
-        
-        # 4. 验证builders结构
-        verify_builders_structure()
-        
-        # 5. 验证方法签名
-        verify_method_signatures()
+        # 2-5 需要导入pysui，--static-only时跳过
+        if not args.static_only:
+            # 2. 验证模块路径
+            verify_module_paths()
+            
+            # 3. 验证类继承
+            verify_class_inheritance()
+            
+            # 4. 验证builders结构
+            verify_builders_structure()
+            
+            # 5. 验证方法签名
+            verify_method_signatures()
         
         # 6. 检查代码模式
         check_code_patterns()
         
-        print("\n" + "=" * 60)
+        print("\n" + _SEP60)
         print("🎉 离线验证完成!")
         print("\n📋 总结:")
         print("✅ 代码导入的是JSON-RPC相关模块")
@@ -297,8 +366,11 @@ def main():
         print("✅ 使用的是pysui.sui.sui_txn.sync_transaction")
         print("✅ 使用的是pysui.sui.sui_builders.get_builders")
         print("✅ 没有使用GraphQL或gRPC相关的模块")
-        print("✅ 方法命名符合JSON-RPC标准")
-        print("=" * 60)
+        if args.static_only:
+            print("ℹ️  已跳过需要导入pysui的检查（--static-only）")
+        else:
+            print("✅ 方法命名符合JSON-RPC标准")
+        print(_SEP60)
         
     except Exception as e:
         print(f"\n❌ 验证过程中出现错误: {e}")
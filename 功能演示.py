@@ -4,9 +4,18 @@ Sui客户端完整功能演示
 展示部署合约、调用合约、发送交易的完整流程
 """
 
-from sui_client import SuiContractClient
+from sui_client import SuiContractClient, OBJECT_QUERY_OPTIONS, TRANSACTION_QUERY_OPTIONS
 import json
-import time
+import sys
+
+
+def _查找创建对象(call_result, 类型片段):
+    """在调用结果的object_changes中查找第一个类型包含类型片段的新建对象，找到即返回其ID"""
+    return next(
+        (change['objectId'] for change in call_result.get('object_changes') or ()
+         if change.get('type') == 'created' and 类型片段 in change.get('objectType', '')),
+        None
+    )
 
 
 def 演示_完整流程():
@@ -19,9 +28,11 @@ def 演示_完整流程():
         # 1. 创建客户端
         print("\n📱 1. 创建Sui客户端...")
         client = SuiContractClient()
-        print(f"   ✅ 客户端创建成功")
-        print(f"   📍 连接到: {client.config.rpc_url}")
-        print(f"   👤 活跃地址: {client.active_address}")
+        print("\n".join([
+            f"   ✅ 客户端创建成功",
+            f"   📍 连接到: {client.config.rpc_url}",
+            f"   👤 活跃地址: {client.active_address}",
+        ]))
         
         # 2. 查询余额
         print("\n💰 2. 查询账户余额...")
@@ -34,10 +45,12 @@ def 演示_完整流程():
             return
         
         # 3. 部署合约
-        print("\n🚀 3. 部署智能合约...")
-        print("   📝 编译Move包...")
-        print("   🔨 生成字节码...")
-        print("   📡 发送部署交易...")
+        print("\n".join([
+            "\n🚀 3. 部署智能合约...",
+            "   📝 编译Move包...",
+            "   🔨 生成字节码...",
+            "   📡 发送部署交易...",
+        ]))
         
         deploy_result = client.deploy_contract(
             package_path="./example_contract",
@@ -48,65 +61,42 @@ def 演示_完整流程():
         upgrade_cap_id = deploy_result['upgrade_cap_id']
         tx_hash = deploy_result['transaction_hash']
         
-        print(f"   ✅ 合约部署成功!")
-        print(f"   📦 包ID: {package_id}")
-        print(f"   🔑 UpgradeCap: {upgrade_cap_id}")
-        print(f"   🔗 交易哈希: {tx_hash}")
-        print(f"   ⛽ Gas使用: {deploy_result['gas_used']}")
+        print("\n".join([
+            f"   ✅ 合约部署成功!",
+            f"   📦 包ID: {package_id}",
+            f"   🔑 UpgradeCap: {upgrade_cap_id}",
+            f"   🔗 交易哈希: {tx_hash}",
+            f"   ⛽ Gas使用: {deploy_result['gas_used']}",
+        ]))
         
         # 等待交易确认
         print("\n⏱️  等待交易确认...")
-        time.sleep(3)
+        client.wait_for_transaction(tx_hash)
         
-        # 4. 调用合约函数 - 创建问候消息
+        # 4、5. 创建问候消息与共享计数器相互独立，合并为一个PTB，只产生一笔交易
+        # （新发布的包要在发布交易执行后才能调用，因此无法与部署合并）
         print("\n📞 4. 调用合约函数 - 创建问候消息...")
-        call_result1 = client.call_contract_function(
-            package_id=package_id,
-            module_name="hello_world",
-            function_name="create_greeting",
-            arguments=[b"Hello from Sui JSON-RPC!"],
-            gas_budget=20_000_000
-        )
-        
-        print(f"   ✅ 函数调用成功!")
-        print(f"   🔗 交易哈希: {call_result1['transaction_hash']}")
-        print(f"   ⛽ Gas使用: {call_result1['gas_used']}")
+        print("📞 5. 调用合约函数 - 创建共享计数器...")
+        with client.ptb_batch(gas_budget=40_000_000) as batch:
+            batch.move_call(package_id, "hello_world", "create_greeting", [b"Hello from Sui JSON-RPC!"])
+            batch.move_call(package_id, "hello_world", "create_counter")
+        call_result1 = batch.result
+        
+        print("\n".join([
+            f"   ✅ 函数调用成功!",
+            f"   🔗 交易哈希: {call_result1['transaction_hash']}",
+            f"   ⛽ Gas使用: {call_result1['gas_used']}",
+        ]))
         
         # 查看创建的对象
-        greeting_object_id = None
-        if call_result1['object_changes']:
-            for change in call_result1['object_changes']:
-                if change.get('type') == 'created' and 'GreetingMessage' in change.get('objectType', ''):
-                    greeting_object_id = change['objectId']
-                    print(f"   📝 创建的问候对象: {greeting_object_id}")
-                    break
-        
-        time.sleep(2)
-        
-        # 5. 调用合约函数 - 创建计数器
-        print("\n📞 5. 调用合约函数 - 创建共享计数器...")
-        call_result2 = client.call_contract_function(
-            package_id=package_id,
-            module_name="hello_world",
-            function_name="create_counter",
-            arguments=[],
-            gas_budget=20_000_000
-        )
-        
-        print(f"   ✅ 计数器创建成功!")
-        print(f"   🔗 交易哈希: {call_result2['transaction_hash']}")
-        
-        # 查找计数器对象ID
-        counter_id = None
-        if call_result2['object_changes']:
-            for change in call_result2['object_changes']:
-                if change.get('type') == 'created' and 'Counter' in change.get('objectType', ''):
-                    counter_id = change['objectId']
-                    print(f"   🔢 创建的计数器: {counter_id}")
-                    break
+        greeting_object_id = _查找创建对象(call_result1, 'GreetingMessage')
+        if greeting_object_id:
+            print(f"   📝 创建的问候对象: {greeting_object_id}")
         
+        counter_id = _查找创建对象(call_result1, 'Counter')
         if counter_id:
-            time.sleep(2)
+            print(f"   🔢 创建的计数器: {counter_id}")
+            client.wait_for_transaction(call_result1['transaction_hash'])
             
             # 6. 调用合约函数 - 增加计数器
             print("\n📞 6. 调用合约函数 - 增加计数器...")
@@ -129,31 +119,42 @@ def 演示_完整流程():
                         if 'old_value' in event_data and 'new_value' in event_data:
                             print(f"   📊 计数变化: {event_data['old_value']} → {event_data['new_value']}")
         
+        # 7、8 两个只读查询相互独立，合并为一次JSON-RPC批量请求，复用已建立的连接
+        calls = [("sui_getTransactionBlock", [deploy_result['transaction_hash'], TRANSACTION_QUERY_OPTIONS])]
+        if greeting_object_id:
+            calls.append(("sui_getObject", [greeting_object_id, OBJECT_QUERY_OPTIONS]))
+        tx_info, *rest = client.batch_call(calls)
+        object_info = rest[0] if rest else None
+        
         # 7. 查询对象信息
         if greeting_object_id:
-            print(f"\n🔍 7. 查询对象信息...")
-            object_info = client.get_object_info(greeting_object_id)
-            print(f"   ✅ 对象查询成功!")
-            print(f"   🆔 对象ID: {greeting_object_id}")
-            print(f"   📋 对象类型: {object_info.get('data', {}).get('type', 'Unknown')}")
-            print(f"   👤 拥有者: {object_info.get('data', {}).get('owner', 'Unknown')}")
+            print("\n".join([
+                f"\n🔍 7. 查询对象信息...",
+                f"   ✅ 对象查询成功!",
+                f"   🆔 对象ID: {greeting_object_id}",
+                f"   📋 对象类型: {object_info.get('data', {}).get('type', 'Unknown')}",
+                f"   👤 拥有者: {object_info.get('data', {}).get('owner', 'Unknown')}",
+            ]))
         
         # 8. 查询交易信息
-        print(f"\n📊 8. 查询交易详情...")
-        tx_info = client.get_transaction_info(deploy_result['transaction_hash'])
-        print(f"   ✅ 交易查询成功!")
-        print(f"   📈 状态: {tx_info.get('effects', {}).get('status', {}).get('status')}")
-        print(f"   ⛽ Gas费用: {tx_info.get('effects', {}).get('gasUsed')}")
-        print(f"   👤 发送者: {tx_info.get('transaction', {}).get('data', {}).get('sender')}")
-        
-        print("\n🎉 完整功能演示成功完成!")
-        print("\n📋 演示的功能:")
-        print("   ✅ 部署Move智能合约")
-        print("   ✅ 调用合约函数")
-        print("   ✅ 发送和确认交易")
-        print("   ✅ 查询对象信息")
-        print("   ✅ 查询交易详情")
-        print("   ✅ 处理事件和状态变化")
+        print("\n".join([
+            f"\n📊 8. 查询交易详情...",
+            f"   ✅ 交易查询成功!",
+            f"   📈 状态: {tx_info.get('effects', {}).get('status', {}).get('status')}",
+            f"   ⛽ Gas费用: {tx_info.get('effects', {}).get('gasUsed')}",
+            f"   👤 发送者: {tx_info.get('transaction', {}).get('data', {}).get('sender')}",
+        ]))
+        
+        print("\n".join([
+            "\n🎉 完整功能演示成功完成!",
+            "\n📋 演示的功能:",
+            "   ✅ 部署Move智能合约",
+            "   ✅ 调用合约函数",
+            "   ✅ 发送和确认交易",
+            "   ✅ 查询对象信息",
+            "   ✅ 查询交易详情",
+            "   ✅ 处理事件和状态变化",
+        ]))
         
         return {
             'package_id': package_id,
@@ -163,56 +164,62 @@ def 演示_完整流程():
             'transactions': [
                 deploy_result['transaction_hash'],
                 call_result1['transaction_hash'],
-                call_result2['transaction_hash'],
                 call_result3['transaction_hash'] if counter_id else None
             ]
         }
         
     except Exception as e:
-        print(f"\n❌ 演示过程中发生错误: {e}")
-        print("💡 请确保:")
-        print("   1. Sui CLI已正确安装和配置")
-        print("   2. 账户有足够的SUI余额")
-        print("   3. 网络连接正常")
-        print("   4. example_contract目录存在且有效")
+        print("\n".join([
+            f"\n❌ 演示过程中发生错误: {e}",
+            "💡 请确保:",
+            "   1. Sui CLI已正确安装和配置",
+            "   2. 账户有足够的SUI余额",
+            "   3. 网络连接正常",
+            "   4. example_contract目录存在且有效",
+        ]))
         return None
 
 
+_单独功能示例 = """
+🔧 单独功能演示
+==============================
+
+1️⃣ 只部署合约:
+```python
+deploy_result = client.deploy_contract('./example_contract')
+package_id = deploy_result['package_id']
+```
+
+2️⃣ 只调用函数:
+```python
+call_result = client.call_contract_function(
+    package_id='0x123...',
+    module_name='hello_world',
+    function_name='create_greeting',
+    arguments=[b'Hello!']
+)
+```
+
+3️⃣ 查询余额:
+```python
+balance = client.get_account_balance()
+print(f'余额: {balance["total_balance_sui"]} SUI')
+```
+"""
+
+
 def 演示_单独功能():
-    """演示每个功能的独立使用"""
-    
-    print("\n🔧 单独功能演示")
-    print("=" * 30)
-    
-    client = SuiContractClient()
-    
-    print("\n1️⃣ 只部署合约:")
-    print("```python")
-    print("deploy_result = client.deploy_contract('./example_contract')")
-    print("package_id = deploy_result['package_id']")
-    print("```")
-    
-    print("\n2️⃣ 只调用函数:")
-    print("```python")
-    print("call_result = client.call_contract_function(")
-    print("    package_id='0x123...',")
-    print("    module_name='hello_world',")
-    print("    function_name='create_greeting',")
-    print("    arguments=[b'Hello!']")
-    print(")")
-    print("```")
-    
-    print("\n3️⃣ 查询余额:")
-    print("```python")
-    print("balance = client.get_account_balance()")
-    print("print(f'余额: {balance[\"total_balance_sui\"]} SUI')")
-    print("```")
+    """演示每个功能的独立使用（只输出示例代码，不创建客户端、不访问网络）"""
+    sys.stdout.write(_单独功能示例)
+    sys.stdout.flush()
 
 
 if __name__ == "__main__":
-    print("选择演示模式:")
-    print("1. 完整流程演示（需要网络和余额）")
-    print("2. 代码示例演示（无需网络）")
+    print("\n".join([
+        "选择演示模式:",
+        "1. 完整流程演示（需要网络和余额）",
+        "2. 代码示例演示（无需网络）",
+    ]))
     
     try:
         choice = input("\n请选择 (1/2): ").strip()
@@ -226,9 +233,11 @@ if __name__ == "__main__":
             演示_单独功能()
             
         else:
-            print("🎯 快速开始:")
-            print("python quick_start.py  # 交互式菜单")
-            print("python 功能演示.py     # 完整演示")
+            print("\n".join([
+                "🎯 快速开始:",
+                "python quick_start.py  # 交互式菜单",
+                "python 功能演示.py     # 完整演示",
+            ]))
             
     except KeyboardInterrupt:
         print("\n\n👋 演示已取消")